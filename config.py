@@ -17,16 +17,48 @@
 #      KODI_PANEL_SETUP
 #
 #    to specify a name different than the default "setup.toml".
-#    
-import toml
+#
+#    Parsing makes use of the fastest TOML module available.  That is
+#    the standard library's tomllib with Python 3.11 or later,
+#    pytomlpp (a C++ wrapper) if installed, and otherwise the
+#    pure-Python toml module that older installations already have.
+#
+try:
+    import tomllib as _toml
+except ImportError:
+    try:
+        import pytomlpp as _toml
+    except ImportError:
+        import toml as _toml
+
+from functools import lru_cache
 import os
 import sys
-    
+
 setup_file = os.getenv('KODI_PANEL_SETUP') or "setup.toml"
 # print("Loading kodi_panel configuration from file:", setup_file)
 
+
+# Read the entire setup file in one go and parse it.  Results are
+# memoized on the file's path and modification time, so that any
+# repeated load of an unchanged file costs nothing.
+#
+# Carriage returns are dropped prior to parsing.  The older toml
+# module tolerated the stray ones that some (Windows-edited) setup
+# files contain, but tomllib is strict about them.
+@lru_cache(maxsize=None)
+def _parse_setup(path, mtime):
+    with open(path, "rb") as f:
+        data = f.read()
+    return _toml.loads(data.decode("utf-8").replace("\r", ""))
+
+
+def load_settings(path=setup_file):
+    return _parse_setup(path, os.path.getmtime(path))
+
+
 try:
-    settings = toml.load(setup_file)
+    settings = load_settings()
 except Exception as e:
     print("Unexpected error trying to load/parse setup file! \n", e)
     sys.exit(1)
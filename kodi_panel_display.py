@@ -28,13 +28,18 @@ try:
     import RPi.GPIO as GPIO
 except ImportError:
     pass
+try:
+    from gpiozero import Button
+except ImportError:
+    Button = None
 
 from luma.core.device import device
 from PIL import Image
 from PIL import ImageDraw
 from PIL import ImageFont
+from PIL import ImageColor
 
-from datetime import datetime, timedelta
+from datetime import datetime
 from aenum import Enum, extend_enum
 from functools import lru_cache
 import copy
@@ -42,11 +47,24 @@ import math
 import time
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+import http.client
+from urllib.parse import urlsplit
 import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+import hashlib
+import tempfile
+import codecs
+import socket
 import io
 import re
 import os
 import threading
+import queue
+import concurrent.futures
 import warnings
 import traceback
 
@@ -221,7 +239,7 @@ SLIDESHOW_BOOLEANS = []
 #
 # Start processing settings...
 #
-if "BASE_URL" in config.settings.keys():
+if "BASE_URL" in config.settings:
     base_url = config.settings["BASE_URL"]
     rpc_url = base_url + "/jsonrpc"
     headers = {'content-type': 'application/json'}
@@ -229,13 +247,107 @@ else:
     print("Settings file does not specify BASE_URL!  Stopping.")
     sys.exit(1)
 
+# A single, persistent HTTP session is used for all communication with
+# Kodi.  That permits HTTP keep-alive, avoiding the setup and teardown
+# of a new TCP connection for every JSON-RPC call and artwork fetch.
+_session = requests.Session()
+_session.headers.update(headers)
+_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+# JSON encoding and decoding for JSON-RPC traffic.  The orjson module,
+# if installed, is considerably faster than the standard library and
+# works directly with bytes.
+if orjson:
+    json_dumps = orjson.dumps
+    json_loads = orjson.loads
+else:
+    def json_dumps(obj):
+        return json.dumps(obj).encode("utf-8")
+    json_loads = json.loads
+
+
 # Is Kodi running locally?
 _local_kodi = (base_url.startswith("http://localhost:") or
                base_url.startswith("https://localhost:"))
 
+# For a local Kodi reached over plain HTTP, JSON-RPC calls go through
+# a single, persistent http.client connection.  That skips the
+# requests/urllib3 machinery (adapters, cookie handling, redirect
+# processing), none of which is needed for a POST to localhost.
+# Artwork retrieval, and everything for a remote Kodi, still uses
+# _session.
+#
+# The artwork prefetch thread, if enabled, also issues calls, hence
+# the lock around that single connection.
+_rpc_conn = None
+_rpc_lock = threading.Lock()
+if _local_kodi and base_url.startswith("http://"):
+    _rpc_url_parts = urlsplit(rpc_url)
+    _rpc_conn = http.client.HTTPConnection(_rpc_url_parts.hostname,
+                                           _rpc_url_parts.port or 80)
+
+
+# Upper bound, in seconds, on any single request to Kodi.  Without
+# one, a Kodi that accepts the connection but never answers would
+# stall the update loop indefinitely.
+RPC_TIMEOUT = config.settings.get("RPC_TIMEOUT", 5)
+
+
+# Report an HTTP error status from Kodi's JSON-RPC endpoint, returning
+# the exception for the caller to raise.  Both transports treat such a
+# response as a lost connection, so that main() goes back to pinging.
+def rpc_status_error(status, body):
+    print(datetime.now(), "Kodi JSON-RPC returned HTTP status", status,
+          body[:200])
+    return ConnectionError("Kodi JSON-RPC returned HTTP status %d" % status)
+
+
+# Issue a JSON-RPC call to Kodi, given the already-serialized payload,
+# and return the decoded response.  Any keyword arguments (e.g.,
+# timeout) are passed through to the underlying post.
+def kodi_rpc(data, **kwargs):
+    kwargs.setdefault("timeout", RPC_TIMEOUT)
+    if _rpc_conn is None:
+        r = _session.post(rpc_url, data=data, **kwargs)
+        if not 200 <= r.status_code < 300:
+            raise rpc_status_error(r.status_code, r.content)
+        return json_loads(r.content)
+
+    with _rpc_lock:
+        _rpc_conn.timeout = kwargs["timeout"]
+        if _rpc_conn.sock is not None:
+            _rpc_conn.sock.settimeout(_rpc_conn.timeout)
+        try:
+            try:
+                _rpc_conn.request("POST", _rpc_url_parts.path, body=data,
+                                  headers=headers)
+                resp = _rpc_conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError):
+                # Kodi closed an idle keep-alive connection; try once
+                # more on a new one before giving up.
+                _rpc_conn.close()
+                _rpc_conn.request("POST", _rpc_url_parts.path, body=data,
+                                  headers=headers)
+                resp = _rpc_conn.getresponse()
+            body = resp.read()
+            if not 200 <= resp.status < 300:
+                raise rpc_status_error(resp.status, body)
+        except http.client.HTTPException as err:
+            # Report protocol failures as a lost connection, just as
+            # requests does, so that main() goes back to pinging Kodi.
+            _rpc_conn.close()
+            raise ConnectionError(err) from err
+        except BaseException:
+            # leave no half-finished exchange on the connection
+            _rpc_conn.close()
+            raise
+    return json_loads(body)
+
 # Image handling
-if ("DISPLAY_WIDTH" in config.settings.keys() and
-        "DISPLAY_HEIGHT" in config.settings.keys()):
+if ("DISPLAY_WIDTH" in config.settings and
+        "DISPLAY_HEIGHT" in config.settings):
     _frame_size = (
         config.settings["DISPLAY_WIDTH"],
         config.settings["DISPLAY_HEIGHT"])
@@ -257,11 +369,13 @@ _image_default = False
 # reused.
 _static_image = None
 _static_video = False  # set True by video_screens(), False by audio_screens()
+_static_layout = None  # layout from which _static_image was rendered
 
 _last_track_num     = None
 _last_track_title   = None
 _last_track_album   = None
 _last_track_time    = None
+_last_track_cover   = None
 _last_video_title   = None
 _last_video_time    = None
 _last_video_episode = None
@@ -272,9 +386,64 @@ _default_audio_thumb = config.settings.get("DEFAULT_AUDIO", "images/music_icon2_
 _default_video_thumb = config.settings.get("DEFAULT_VIDEO", "images/video_icon2.png")
 _default_airplay_thumb = config.settings.get("DEFAULT_AIRPLAY", "images/airplay_thumb.png")
 
-# RegEx for recognizing AirPlay images (compiled once)
+# On-disk cache of resized artwork.  If a directory is specified,
+# artwork retrieved from Kodi gets saved there after resizing, so that
+# a later request for the same artwork at the same size needs no
+# network activity, decoding, or resizing.  At most ARTWORK_CACHE_SIZE
+# files are retained, discarding the least-recently used.
+ARTWORK_CACHE_DIR  = config.settings.get("ARTWORK_CACHE_DIR", "")
+ARTWORK_CACHE_SIZE = config.settings.get("ARTWORK_CACHE_SIZE", 200)
+
+if ARTWORK_CACHE_DIR:
+    ARTWORK_CACHE_DIR = os.path.expanduser(ARTWORK_CACHE_DIR)
+    try:
+        os.makedirs(ARTWORK_CACHE_DIR, exist_ok=True)
+    except OSError:
+        warnings.warn("Unable to create ARTWORK_CACHE_DIR!  Disabling artwork cache.")
+        ARTWORK_CACHE_DIR = ""
+
+# Fetch the next track's cover art in the background?  When enabled,
+# the cover of the next playlist entry gets retrieved and resized by a
+# worker thread while the current track plays, so that the track
+# change itself finds the artwork already in get_artwork()'s cache.
+PREFETCH_ARTWORK = config.settings.get("PREFETCH_ARTWORK", False)
+_artwork_executor = None
+
+# Resampling filter used when resizing artwork, specified by name
+# (nearest, box, bilinear, hamming, bicubic, or lanczos).  Pillow's
+# thumbnail() otherwise defaults to the slowest, lanczos, which is
+# difficult to distinguish from bilinear at typical cover art sizes.
+_resampling = getattr(Image, "Resampling", Image)   # Pillow >= 9.1
+ARTWORK_RESAMPLE = getattr(
+    _resampling,
+    config.settings.get("ARTWORK_RESAMPLE", "bilinear").upper(),
+    _resampling.BILINEAR)
+
+# RegEx for recognizing AirPlay images (compiled once).  The plain
+# prefix check is far cheaper and suffices to rule out all other
+# artwork, so the RegEx only gets used once that has passed.
 _airtunes_re = re.compile(
     r'^special:\/\/temp\/(airtunes_album_thumb\.(png|jpg))')
+_AIRTUNES_PREFIX = "special://temp/airtunes_album_thumb."
+
+# Matches are memoized, as callers check a cover path via is_airtunes()
+# before get_airplay_art() needs the match itself.
+@lru_cache(maxsize=8)
+def match_airtunes(cover_path):
+    if cover_path.startswith(_AIRTUNES_PREFIX):
+        return _airtunes_re.match(cover_path)
+    return None
+
+def is_airtunes(cover_path):
+    return match_airtunes(cover_path) is not None
+
+# Resized AirPlay artwork, keyed by a hash of the image file's
+# contents together with the requested size.  The AirPlay file name
+# never changes, so its contents are the only usable key.  A track
+# change back to an earlier album then costs a read and a hash,
+# rather than a decode and a resize.
+_airplay_thumbs = {}
+_AIRPLAY_THUMBS_MAX = 8
 
 
 #
@@ -290,18 +459,23 @@ if DEBUG_ART:    print("DEBUG_ART print statements enabled.")
 #
 # Load all user-specified fonts
 #
+#   Font objects are shared through load_font(), so that setup files
+#   declaring the same path and size under several names only open
+#   and parse the font file once.  Sharing the object also lets the
+#   text-wrapping caches (which are keyed on the font) hit across
+#   those names.
+#
+@lru_cache(maxsize=None)
+def load_font(path, size, encoding=""):
+    return ImageFont.truetype(path, size, encoding=encoding)
+
 _fonts = {}
-if "fonts" in config.settings.keys():
+if "fonts" in config.settings:
     for user_font in config.settings["fonts"]:
         try:
-            if "encoding" in user_font.keys():
-                _fonts[user_font["name"]] = ImageFont.truetype(
-                    user_font["path"], user_font["size"], encoding=user_font["encoding"]
-                )
-            else:
-                _fonts[user_font["name"]] = ImageFont.truetype(
-                    user_font["path"], user_font["size"]
-                )
+            _fonts[user_font["name"]] = load_font(
+                user_font["path"], user_font["size"], user_font.get("encoding", "")
+            )
         except OSError:
             print(
                 "Unable to load font ",  user_font["name"],
@@ -313,7 +487,7 @@ else:
     sys.exit(1)
 
 
-if "font_main" in _fonts.keys():
+if "font_main" in _fonts:
     pass
 else:
     print("fonts table must specify a 'font_main' entry!  Stopping.")
@@ -323,7 +497,7 @@ else:
 #
 # Color lookup table
 #
-if "COLORS" in config.settings.keys():
+if "COLORS" in config.settings:
     _colors = config.settings.get("COLORS", {})
 else:
     print("Settings file does not provide a COLORS table!  Stopping.")
@@ -334,19 +508,22 @@ else:
 # Check for any additional InfoLabels to retrieve
 #
 
-if ("STATUS_LABELS" in config.settings.keys() and
+if ("STATUS_LABELS" in config.settings and
         type(config.settings["STATUS_LABELS"]) == list):
     STATUS_LABELS += config.settings["STATUS_LABELS"]
 
-if ("AUDIO_LABELS" in config.settings.keys() and
+if ("AUDIO_LABELS" in config.settings and
         type(config.settings["AUDIO_LABELS"]) == list):
     AUDIO_LABELS += config.settings["AUDIO_LABELS"]
 
-if ("VIDEO_LABELS" in config.settings.keys() and
+if PREFETCH_ARTWORK:
+    AUDIO_LABELS.append("MusicPlayer.Offset(1).Cover")
+
+if ("VIDEO_LABELS" in config.settings and
         type(config.settings["VIDEO_LABELS"]) == list):
     VIDEO_LABELS += config.settings["VIDEO_LABELS"]
 
-if ("SLIDESHOW_LABELS" in config.settings.keys() and
+if ("SLIDESHOW_LABELS" in config.settings and
         type(config.settings["SLIDESHOW_LABELS"]) == list):
     SLIDESHOW_LABELS += config.settings["SLIDESHOW_LABELS"]
 
@@ -354,30 +531,64 @@ if ("SLIDESHOW_LABELS" in config.settings.keys() and
 # Also check for any additional InfoBooleans to retrieve
 #
 
-if ("STATUS_BOOLEANS" in config.settings.keys() and
+if ("STATUS_BOOLEANS" in config.settings and
         type(config.settings["STATUS_BOOLEANS"]) == list):
     STATUS_BOOLEANS += config.settings["STATUS_BOOLEANS"]
 
-if ("AUDIO_BOOLEANS" in config.settings.keys() and
+if ("AUDIO_BOOLEANS" in config.settings and
         type(config.settings["AUDIO_BOOLEANS"]) == list):
     AUDIO_BOOLEANS += config.settings["AUDIO_BOOLEANS"]
 
-if ("VIDEO_BOOLEANS" in config.settings.keys() and
+if ("VIDEO_BOOLEANS" in config.settings and
         type(config.settings["VIDEO_BOOLEANS"]) == list):
     VIDEO_BOOLEANS += config.settings["VIDEO_BOOLEANS"]
 
-if ("SLIDESHOW_BOOLEANS" in config.settings.keys() and
+if ("SLIDESHOW_BOOLEANS" in config.settings and
         type(config.settings["SLIDESHOW_BOOLEANS"]) == list):
     SLIDESHOW_BOOLEANS += config.settings["SLIDESHOW_BOOLEANS"]
 
 #
 # Permit codec_name table to be augmented
 #
-if ("CODECS" in config.settings.keys() and
+if ("CODECS" in config.settings and
     type(config.settings["CODECS"]) == dict):
     codec_name.update( config.settings["CODECS"] )
 
 
+#
+# InfoLabel / InfoBoolean requests
+#
+#   Lookup table, keyed by the "type" that Kodi's GetActivePlayers
+#   reports (plus "status" for the idle screen), giving the label and
+#   boolean lists to retrieve along with the JSON-RPC id to use.  The
+#   InfoBooleans call, if any, uses the same id with an "i" appended.
+#
+#   The lists are referenced, not copied, so any additions made to
+#   them prior to calling main() are still honored.  (Payloads get
+#   serialized upon first use.)
+#
+_INFO_REQUESTS = {
+    'status'  : (STATUS_LABELS,    STATUS_BOOLEANS,    "4st"),
+    'video'   : (VIDEO_LABELS,     VIDEO_BOOLEANS,     "4v"),
+    'audio'   : (AUDIO_LABELS,     AUDIO_BOOLEANS,     "4a"),
+    'picture' : (SLIDESHOW_LABELS, SLIDESHOW_BOOLEANS, "4s"),
+}
+
+# The remaining fixed JSON-RPC calls.  The ping is only ever sent by
+# itself, so it is kept pre-serialized.
+_ACTIVE_PLAYERS = {
+    "jsonrpc": "2.0",
+    "method": "Player.GetActivePlayers",
+    "id": 3,
+}
+
+_PING_PAYLOAD = json_dumps({
+    "jsonrpc": "2.0",
+    "method": "JSONRPC.Ping",
+    "id": 2,
+})
+
+
 #
 # Which display screens are enabled for use?
 #
@@ -419,7 +630,7 @@ class ScreenMode(Enum):
 _SHARED_ELEMENT = {}
 _USE_SHARED = False
 
-if ("shared_element" in config.settings.keys() and
+if ("shared_element" in config.settings and
         type(config.settings["shared_element"]) is dict):
     _SHARED_ELEMENT = config.settings["shared_element"]
 
@@ -445,9 +656,14 @@ if len(_SHARED_ELEMENT.keys()):
 #   originally suggested by @noggin in the CE Forums.
 #
 
-# Base class, providing the next() functionality
+# Base class, providing the next() functionality.  Successors are
+# looked up in _NEXT_LAYOUT, populated below once the enums have been
+# extended, with the list-based search kept for any member added
+# after that.
 class LayoutEnum(Enum):
     def next(self):
+        if self in _NEXT_LAYOUT:
+            return _NEXT_LAYOUT[self]
         cls = self.__class__
         members = list(cls)
         index = members.index(self) + 1
@@ -470,8 +686,8 @@ class IDisplay(LayoutEnum): pass   # status/info screen
 #
 
 if AUDIO_ENABLED:
-    if ("ALAYOUT_NAMES" in config.settings.keys() and
-            "ALAYOUT_INITIAL" in config.settings.keys()):
+    if ("ALAYOUT_NAMES" in config.settings and
+            "ALAYOUT_INITIAL" in config.settings):
         for index, value in enumerate(config.settings["ALAYOUT_NAMES"]):
             extend_enum(ADisplay, value, index)
 
@@ -490,8 +706,8 @@ if AUDIO_ENABLED:
 
 
 if VIDEO_ENABLED:
-    if ("VLAYOUT_NAMES" in config.settings.keys() and
-            "VLAYOUT_INITIAL" in config.settings.keys()):
+    if ("VLAYOUT_NAMES" in config.settings and
+            "VLAYOUT_INITIAL" in config.settings):
         # Populate enum based upon settings file
         for index, value in enumerate(config.settings["VLAYOUT_NAMES"]):
             extend_enum(VDisplay, value, index)
@@ -511,8 +727,8 @@ if VIDEO_ENABLED:
 
 
 if SLIDESHOW_ENABLED:
-    if ("SLAYOUT_NAMES" in config.settings.keys() and
-            "SLAYOUT_INITIAL" in config.settings.keys()):
+    if ("SLAYOUT_NAMES" in config.settings and
+            "SLAYOUT_INITIAL" in config.settings):
         # Populate enum based upon settings file
         for index, value in enumerate(config.settings["SLAYOUT_NAMES"]):
             extend_enum(SDisplay, value, index)
@@ -540,8 +756,8 @@ if SLIDESHOW_ENABLED:
 # consistent due to the development history of this feature.
 
 if STATUS_ENABLED:
-    if ("STATUS_NAMES" in config.settings.keys() and
-            "STATUS_INITIAL" in config.settings.keys()):
+    if ("STATUS_NAMES" in config.settings and
+            "STATUS_INITIAL" in config.settings):
         # Populate enum based upon settings file
         for index, value in enumerate(config.settings["STATUS_NAMES"]):
             extend_enum(IDisplay, value, index)
@@ -557,13 +773,23 @@ if STATUS_ENABLED:
         STATUS_LAYOUT_AUTOSELECT = False
 
 
+# Precompute each layout's successor, for use by LayoutEnum.next()
+_NEXT_LAYOUT = {}
+for _layout_enum in (ADisplay, VDisplay, SDisplay, IDisplay):
+    _members = list(_layout_enum)
+    for _index, _member in enumerate(_members):
+        _NEXT_LAYOUT[_member] = _members[(_index + 1) % len(_members)]
+
+
 
 # Screen Layouts
 # --------------
 #
 # Fixup font and color entries now, so that further table lookups are
 # not necessary at run-time.  Also provide for shared element
-# replacement.
+# replacement.  Position tuples (and the available width for truncated
+# fields) are likewise computed once here, rather than being rebuilt
+# by draw_fields() on every update.
 #
 
 def fixup_layouts(nested_dict):
@@ -591,6 +817,13 @@ def fixup_layouts(nested_dict):
                   key == "smfont"):
                 # Lookup font
                 newdict[key] = _fonts[value]
+
+    if "posx" in newdict and "posy" in newdict:
+        newdict["pos"] = (newdict["posx"], newdict["posy"])
+        if "trunc" in newdict:
+            newdict["trunc_width"] = _frame_size[0] - newdict["posx"]
+    if "lposx" in newdict and "lposy" in newdict:
+        newdict["lpos"] = (newdict["lposx"], newdict["lposy"])
     return newdict
 
 
@@ -611,7 +844,7 @@ def fixup_array(array):
 
 
 # Patch up the audio layout nested dictionary
-if (AUDIO_ENABLED and "A_LAYOUT" in config.settings.keys()):
+if (AUDIO_ENABLED and "A_LAYOUT" in config.settings):
     AUDIO_LAYOUT = fixup_layouts(config.settings["A_LAYOUT"])
 elif AUDIO_ENABLED:
     warnings.warn(
@@ -619,7 +852,7 @@ elif AUDIO_ENABLED:
     AUDIO_ENABLED = 0
 
 # Patch up the video layout nested dictionary
-if (VIDEO_ENABLED and "V_LAYOUT" in config.settings.keys()):
+if (VIDEO_ENABLED and "V_LAYOUT" in config.settings):
     VIDEO_LAYOUT = fixup_layouts(config.settings["V_LAYOUT"])
 elif VIDEO_ENABLED:
     warnings.warn(
@@ -627,7 +860,7 @@ elif VIDEO_ENABLED:
     VIDEO_ENABLED = 0
 
 # Patch up the slideshow layout nested dictionary
-if (SLIDESHOW_ENABLED and "S_LAYOUT" in config.settings.keys()):
+if (SLIDESHOW_ENABLED and "S_LAYOUT" in config.settings):
     SLIDESHOW_LAYOUT = fixup_layouts(config.settings["S_LAYOUT"])
 elif SLIDESHOW_ENABLED:
     warnings.warn(
@@ -635,7 +868,7 @@ elif SLIDESHOW_ENABLED:
     SLIDESHOW_ENABLED = 0
 
 # Finally, patch up the status/info screen layout
-if (STATUS_ENABLED and "STATUS_LAYOUT" in config.settings.keys()):
+if (STATUS_ENABLED and "STATUS_LAYOUT" in config.settings):
     STATUS_LAYOUT = fixup_layouts(config.settings["STATUS_LAYOUT"])
 else:
     warnings.warn("Cannot find any STATUS_LAYOUT screen settings in setup file!  Disabling status/info screen.")
@@ -663,22 +896,47 @@ TOUCH_INT = config.settings.get("TOUCH_INT", 0)
 TOUCH_PULLUP   = config.settings.get("TOUCH_PULLUP", False)
 TOUCH_DEBOUNCE = config.settings.get("TOUCH_DEBOUNCE", 700)  # milliseconds
 
+# On a Raspberry Pi, gpiozero (with its lgpio or pigpio backends) can
+# be used to watch T_IRQ instead.  That waits on edges via the kernel's
+# GPIO character device, rather than having RPi.GPIO's polling thread
+# wake up frequently.  RPi.GPIO remains the default, as it is what
+# works on Odroid boards (via RPi.GPIO-Odroid).
+TOUCH_GPIOZERO = config.settings.get("TOUCH_GPIOZERO", False)
+_touch_button  = None
+
 # Internal state variables used to manage screen presses
 _kodi_connected = False
 _kodi_playing   = False
 _screen_active  = False
 
+# Which entry of _INFO_REQUESTS, if any, to speculatively include in
+# update_display()'s batch request.  Set to whatever was needed on
+# the previous update.
+_prefetch_info  = None
+
+# Identifies what update_display() last rendered, so that an identical
+# frame need not be redrawn and sent to the display again.  See
+# same_frame() below.
+_last_frame_key = None
+
 # Touchscreen state
 _screen_press = threading.Event()
 
+# Set to cut short the main loop's wait for the next update, whether
+# by a screen press or a notification from Kodi
+_kodi_wake = threading.Event()
+
 # status screen waketime, in seconds
 _screen_wake = config.settings.get("SCREEN_WAKE_TIME", 25)
-_screen_offtime = datetime.now()
+_screen_offtime = time.monotonic()
 
 # Provide a lock to ensure update_display() is single-threaded.  (This
 # is perhaps unnecessary given Python's GIL, but is certainly safe.)
 _lock = threading.Lock()
 
+# Interval between successive update_display() calls, in seconds
+UPDATE_INTERVAL = 0.985
+
 # Additional screen controls.  Note that RPi.GPIO's PWM control, even
 # the Odroid variant, uses software (pthreads) to control the signal,
 # which can result in flickering.  At present (Oct 2020), I cannot
@@ -700,6 +958,38 @@ USE_PWM = False
 PWM_FREQ = 362       # frequency, presumably in Hz
 PWM_LEVEL = 75.0     # float value between 0 and 100
 
+# Should rendering and display updates be skipped when nothing Kodi
+# reports has changed?  Off by default, as element and string
+# callbacks that draw something NOT derived from Kodi's InfoLabels
+# (e.g., the local clock) would then stop updating.  Only enable it
+# if every callback in use depends solely on the info dictionary.
+SKIP_UNCHANGED_FRAMES = config.settings.get("SKIP_UNCHANGED_FRAMES", False)
+
+# Should display updates be performed by a separate thread?  For
+# SPI-attached displays, device.display() is a lengthy blocking
+# transfer.  Handing each finished frame to a worker thread permits
+# the next Kodi poll to proceed concurrently.  (Never used with the
+# pygame emulator, which must be driven from the main thread.)
+DISPLAY_THREAD = config.settings.get("DISPLAY_THREAD", False)
+
+# Should Kodi's JSON-RPC notifications also be used?  Kodi pushes
+# events such as Player.OnPause, Player.OnSeek, and Player.OnStop over
+# its raw TCP JSON-RPC interface (port 9090 by default, enabled along
+# with "Allow remote control from applications on other systems").
+# Each such notification triggers an immediate update, so pauses and
+# track changes need not wait for the next poll.  Polling continues
+# regardless, to keep elapsed time and progress bars moving.
+KODI_NOTIFY = config.settings.get("KODI_NOTIFY", False)
+KODI_NOTIFY_PORT = config.settings.get("KODI_NOTIFY_PORT", 9090)
+_NOTIFY_PREFIXES = ("Player.", "GUI.", "Application.")
+_notify_thread = None
+
+# Minimum time, in seconds, between notification-driven wakes.  Bursts
+# (e.g., Application.OnVolumeChanged while a volume key is held) then
+# cost one extra update rather than one per message; anything skipped
+# is picked up by the regular poll.
+_NOTIFY_MIN_INTERVAL = 0.25
+
 # Are we running using luma.lcd's pygame demo mode?  This variable
 # gets modified directly by kodi_panel_demo.py.
 DEMO_MODE = False
@@ -714,6 +1004,29 @@ DEMO_MODE = False
 image = Image.new('RGB', (_frame_size), 'black')
 draw = ImageDraw.Draw(image)
 
+# Blank frame, pasted whenever the screen needs clearing
+_blank_frame = Image.new('RGB', (_frame_size), 'black')
+
+# Frame shown while waiting for Kodi, rendered just once
+_waiting_frame = _blank_frame.copy()
+ImageDraw.Draw(_waiting_frame).text(
+    (5, 5), "Waiting to connect with Kodi...",
+    fill='white', font=_fonts["font_main"])
+
+# Single-slot queue feeding the display thread, if one is in use.
+# Only the most recent frame is of interest, so a frame still waiting
+# when the next arrives just gets replaced.
+_display_queue = queue.Queue(maxsize=1)
+_display_thread = None
+
+# Pair of frame buffers handed to the display thread.  Each buffer is
+# always in exactly one place: this free list, _display_queue, or in
+# the hands of display_worker().  Frames are pasted into a buffer,
+# rather than allocating a fresh copy for every update.
+_free_buffers = queue.Queue()
+for _ in range(2):
+    _free_buffers.put(Image.new('RGB', (_frame_size), 'black'))
+
 
 # ----------------------------------------------------------------------------
 
@@ -814,20 +1127,16 @@ def strcb_upnp_playback(info, screen_mode, layout_name):
 # common names.
 def strcb_codec(info, screen_mode, layout_name):
     if 'MusicPlayer.Codec' in info:
-        if info['MusicPlayer.Codec'] in codec_name:
-            return codec_name[info['MusicPlayer.Codec']]
-        else:
-            return info['MusicPlayer.Codec']
+        codec = info['MusicPlayer.Codec']
+        return codec_name.get(codec, codec)
     return ""
 
 
 # Similar function for AudioCodec lookup when playing video
 def strcb_acodec(info, screen_mode, layout_name):
     if 'VideoPlayer.AudioCodec' in info:
-        if info['VideoPlayer.AudioCodec'] in codec_name.keys():
-            return codec_name[info['VideoPlayer.AudioCodec']]
-        else:
-            return info['VideoPlayer.AudioCodec']
+        codec = info['VideoPlayer.AudioCodec']
+        return codec_name.get(codec, codec)
     return ""
 
 
@@ -845,10 +1154,8 @@ def strcb_full_codec(info, screen_mode, layout_name):
     if (screen_mode == ScreenMode.AUDIO and
         'MusicPlayer.Codec' in info):
 
-        if info['MusicPlayer.Codec'] in codec_name:
-            display_text = codec_name[info['MusicPlayer.Codec']]
-        else:
-            display_text = info['MusicPlayer.Codec']
+        codec = info['MusicPlayer.Codec']
+        display_text = codec_name.get(codec, codec)
 
         # augment with (bit/sample) information
         display_text += " (" + info['MusicPlayer.BitsPerSample'] + "/" + \
@@ -950,7 +1257,7 @@ def element_audio_cover(image, draw, info, field, screen_mode, layout_name):
     # The following is somewhat redundate with code that
     # exists in audio_screen_static().
     artwork = None
-    if _airtunes_re.match(image_path):
+    if is_airtunes(image_path):
         artwork = get_airplay_art(image_path, None,
                                   field["size"], field["size"],
                                   enlarge=field.get("enlarge", False))
@@ -1019,11 +1326,11 @@ def strcb_kodi_version(info, screen_mode, layout_name):
 def element_time_hrmin(image, draw, info, field, screen_mode, layout_name):
     if "System.Time" in info:
         time_parts = info['System.Time'].split(" ")
-        time_width, time_height = draw.textsize(time_parts[0], field["font"])
-        draw.text((field["posx"], field["posy"]),
+        time_width = int(text_width(field["font"], time_parts[0]))
+        draw_text(image, draw, (field["posx"], field["posy"]),
                   time_parts[0],
                   field["fill"], field["font"])
-        draw.text((field["posx"] + time_width + 5, field["posy"]),
+        draw_text(image, draw, (field["posx"] + time_width + 5, field["posy"]),
                   time_parts[1],
                   field["fill"], field["smfont"])
 
@@ -1188,46 +1495,76 @@ STRING_CB = {
 # example layout, having the album title to the right of the cover art
 # works better if one can wrap it across at least two lines.
 
-@lru_cache(maxsize=20)
-def truncate_line(line, font, max_width):
-    truncating = 0
-    new_text = line
-
-    # Form an initial estimate of how many characters will fit,
-    # leaving some margin.
-    t_width = font.getsize(line)[0]
-    if t_width <= max_width:
-        return line
+# Horizontal extent of text in the given font.  getlength() provides
+# just the advance width, which is cheaper than a full bounding box.
+# Results are cached, as the same few strings (ellipsis, clock time)
+# get measured on every update.
+@lru_cache(maxsize=256)
+def text_width(font, text):
+    return font.getlength(text)
+
+
+# Pre-rendered text.  text_mask() rasterizes a string just once,
+# returning its glyph coverage as an "L" Image along with the mask's
+# offset from the anchor point.  draw_text() then pastes the fill
+# color through that mask, producing the same pixels as
+# ImageDraw.text() without another trip through FreeType.
+@lru_cache(maxsize=128)
+def text_mask(text, font, anchor="la", fontmode="L"):
+    (left, top, right, bottom) = font.getbbox(text, anchor=anchor)
+    mask = Image.new("L", (max(right - left, 0), max(bottom - top, 0)), 0)
+    mask_draw = ImageDraw.Draw(mask)
+    mask_draw.fontmode = fontmode
+    mask_draw.text((-left, -top), text, fill=255, font=font, anchor=anchor)
+    return ((left, top), mask)
+
+
+def draw_text(image, draw, xy, text, fill, font, anchor="la"):
+    # Multi-line strings are left to ImageDraw
+    if "\n" in text:
+        draw.text(xy, text, fill, font, anchor)
+        return
 
-    avg_char = len(new_text) / t_width
-    num_chars = int(max_width / avg_char) + 4
-    new_text = new_text[0:num_chars]
+    ((left, top), mask) = text_mask(text, font, anchor, draw.fontmode)
+    if (mask.size[0] and mask.size[1]):
+        image.paste(fill, (xy[0] + left, xy[1] + top), mask)
 
-    # Leave room for ellipsis
-    avail_width = max_width - font.getsize("\u2026")[0] + 6
 
-    # Now perform naive truncation
-    t_width = font.getsize(new_text)[0]
-    while (t_width > avail_width):
-        truncating = 1
-        new_text = new_text[:-1]
-        t_width = font.getsize(new_text)[0]
+# Truncate a single line of text, placing an ellipsis at the end, such
+# that it fits within max_width pixels.  The longest prefix that fits
+# is found via a binary search, needing only O(log n) width
+# measurements rather than one per character removed.
+#
+# Results are memoized.  Pillow font objects are hashable, so the
+# (line, font, max_width) arguments serve directly as the cache key.
+@lru_cache(maxsize=64)
+def truncate_line(line, font, max_width):
+    if text_width(font, line) <= max_width:
+        return line
 
-    final_text = new_text
-    if truncating:
-        final_text += "\u2026"
+    # Leave room for ellipsis
+    avail_width = max_width - text_width(font, "\u2026") + 6
+
+    low  = 0
+    high = len(line)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if text_width(font, line[0:mid]) <= avail_width:
+            low = mid
+        else:
+            high = mid - 1
 
-    return final_text
+    return line[0:low] + "\u2026"
 
 
-@lru_cache(maxsize=20)
+@lru_cache(maxsize=64)
 def text_wrap(text, font, max_width, max_lines=None):
     lines = []
 
     # If the width of the text is smaller than image width
     # we don't need to split it, just add it to the lines array
     # and return
-    if font.getsize(text)[0] <= max_width:
+    if text_width(font, text) <= max_width:
         lines.append(text)
     elif max_lines and max_lines == 1:
         # only a single line available, so just truncate
@@ -1239,8 +1576,8 @@ def text_wrap(text, font, max_width, max_lines=None):
         # append every word to a line while its width is shorter than max width
         while i < len(words):
             line = ''
-            while i < len(words) and font.getsize(
-                    line + words[i])[0] <= max_width:
+            while i < len(words) and text_width(
+                    font, line + words[i]) <= max_width:
                 line = line + words[i] + " "
                 i += 1
             if not line:
@@ -1261,16 +1598,42 @@ def text_wrap(text, font, max_width, max_lines=None):
 # Render text at the specified location, wrapping lines if possible
 # and truncating characters on the final line (with ellipsis placed)
 # if the string is too wide to display in its entirety.
-def render_text_wrap(pil_draw, xy, text, max_width, max_lines, fill, font):
+#
+# If the Image being drawn into is also passed, lines are pasted via
+# draw_text(), so that a title or album persisting across many updates
+# is only rasterized once.
+def render_text_wrap(pil_draw, xy, text, max_width, max_lines, fill, font,
+                     image=None):
     line_array = text_wrap(text, font, max_width, max_lines)
-    line_height = font.getsize('Ahgy')[1]
+    line_height = font_line_height(font)
     (posx, posy) = xy
     for line in line_array:
-        pil_draw.text((posx, posy), line, fill, font)
+        if image is None:
+            pil_draw.text((posx, posy), line, fill, font)
+        else:
+            draw_text(image, pil_draw, (posx, posy), line, fill, font)
         posy = posy + line_height
     return
 
 
+# Line spacing for wrapped text: the bottom of the tallest and
+# deepest glyphs, as measured from the top of the line.  (This is
+# the same height that the old getsize() reported.)
+@lru_cache(maxsize=None)
+def font_line_height(font):
+    return font.getbbox('Ahgy')[3]
+
+
+# Colors in layouts are typically strings (names or hex values).
+# Converting them just once spares ImageDraw from parsing them again
+# on every call.
+@lru_cache(maxsize=None)
+def rgb_color(color):
+    if isinstance(color, str):
+        return ImageColor.getrgb(color)
+    return color
+
+
 # Draw a horizontal (by default) progress bar at the specified
 # location, filling from left to right.  A vertical bar can be drawn
 # if specified, filling from bottom to top.
@@ -1291,8 +1654,8 @@ def progress_bar(draw,
                  use_long_len = False):
 
     # Pull out colors, position, and size info from field_dict
-    bgcolor = field_dict["color_bg"]
-    color   = field_dict["color_fg"]
+    bgcolor = rgb_color(field_dict["color_bg"])
+    color   = rgb_color(field_dict["color_fg"])
 
     x = field_dict["posx"]
     y = field_dict["posy"]
@@ -1328,25 +1691,26 @@ def progress_bar(draw,
     if progress > 1:
         progress = 1
 
-    # Foreground rectangle (progress indictor)
-    if "vertical" in field_dict.keys():
-        dh = h * progress
+    # Foreground rectangle (progress indictor), with its length
+    # rounded to whole pixels just once
+    if "vertical" in field_dict:
+        dh = int(h * progress + 0.5)
         draw.rectangle((x, y + h - dh, x + w, y + h), fill=color)
-        if "circle" in field_dict.keys():
+        if "circle" in field_dict:
             r = int(field_dict["circle"])  # radius
             draw.ellipse(
-                (x+(0.5*w)-r, y+h-dh-r, x+(0.5*w)+r, y+h-dh+r),
+                (x+(w//2)-r, y+h-dh-r, x+(w//2)+r, y+h-dh+r),
                 fill    = field_dict.get("circle_fill","black"),
                 outline = field_dict.get("circle_outline","white")
             )
 
     else:
-        dw = w * progress
+        dw = int(w * progress + 0.5)
         draw.rectangle((x, y, x + dw, y + h), fill=color)
-        if "circle" in field_dict.keys():
+        if "circle" in field_dict:
             r = int(field_dict["circle"])  # radius
             draw.ellipse(
-                (x+dw-r, y+(0.5*h)-r, x+dw+r, y+(0.5*h)+r),
+                (x+dw-r, y+(h//2)-r, x+dw+r, y+(h//2)+r),
                 fill    = field_dict.get("circle_fill","black"),
                 outline = field_dict.get("circle_outline","white")
             )
@@ -1354,6 +1718,62 @@ def progress_bar(draw,
 
 
 
+# Resize artwork to fit within thumb_width x thumb_height, maintaining
+# its aspect ratio.  Artwork that is smaller than that in either
+# dimension is only enlarged if requested.
+#
+# The enlargement arithmetic is done with integers.  Whichever
+# dimension constrains the aspect ratio is set exactly to its limit.
+#
+def resize_artwork(cover, thumb_width, thumb_height, enlarge=False):
+    (width, height) = cover.size
+
+    if (enlarge and (width < thumb_width or
+                     height < thumb_height)):
+        # Figure out which dimension is the constraint
+        # for maintenance of the aspect ratio
+        if thumb_width * height <= thumb_height * width:
+            new_size = (thumb_width, height * thumb_width // width)
+        else:
+            new_size = (width * thumb_height // height, thumb_height)
+        return cover.resize(new_size, ARTWORK_RESAMPLE)
+
+    # reduce while maintaining aspect ratio, which should
+    # be precisely what thumbnail accomplishes
+    cover.thumbnail((thumb_width, thumb_height), ARTWORK_RESAMPLE)
+    return cover
+
+
+# Open and decode artwork that is destined for resizing to fit within
+# thumb_width x thumb_height.  For JPEGs, draft() has libjpeg decode
+# at a reduced scale (1/2, 1/4, or 1/8), skipping much of the full
+# resolution decode.  Other formats ignore draft().
+#
+# The requested size keeps the same margin that thumbnail()'s own
+# draft() call would (its default reducing_gap of 2.0), so that the
+# final resampling step still has enough detail to work from.  Doing
+# the draft here, rather than leaving it to thumbnail(), lets load()
+# surface any decoding error while the caller can still fall back to
+# a default image.
+_ARTWORK_REDUCING_GAP = 2.0
+
+def open_artwork(fp, thumb_width, thumb_height):
+    cover = Image.open(fp)
+    cover.draft(None, (int(thumb_width * _ARTWORK_REDUCING_GAP),
+                       int(thumb_height * _ARTWORK_REDUCING_GAP)))
+    cover.load()
+    return cover
+
+
+# Default artwork (the audio, video, and AirPlay images specified in
+# the setup file) at the requested size.  These files never change, so
+# each is opened and resized just once per size.
+@lru_cache(maxsize=16)
+def default_artwork(default_path, thumb_width, thumb_height, enlarge=False):
+    return resize_artwork(Image.open(default_path),
+                          thumb_width, thumb_height, enlarge)
+
+
 # Retrieve AirPlay (audio) cover art.
 #
 # This function is distinct from the more general get_artwork() since
@@ -1390,10 +1810,7 @@ def get_airplay_art(cover_path, prev_image, thumb_width, thumb_height, enlarge=F
                        },
             "id": "5b",
         }
-        response = requests.post(
-            rpc_url,
-            data=json.dumps(payload),
-            headers=headers).json()
+        response = kodi_rpc(json_dumps(payload))
         if DEBUG_ART:
             print("Airplay image details: ", json.dumps(response))  # debug info
 
@@ -1414,10 +1831,7 @@ def get_airplay_art(cover_path, prev_image, thumb_width, thumb_height, enlarge=F
                 "params": {"path": image_path},
                 "id": "5c",
             }
-            response = requests.post(
-                rpc_url,
-                data=json.dumps(payload),
-                headers=headers).json()
+            response = kodi_rpc(json_dumps(payload))
             if DEBUG_ART:
                 print("Airplay prepare response: ", json.dumps(response))  # debug info
 
@@ -1428,62 +1842,67 @@ def get_airplay_art(cover_path, prev_image, thumb_width, thumb_height, enlarge=F
             except BaseException:
                 pass
 
-            r = requests.get(image_url, stream=True)
+            r = _session.get(image_url, stream=True, timeout=RPC_TIMEOUT)
             # check that the retrieval was successful before proceeding
             if r.status_code == 200:
                 try:
-                    r.raw.decode_content = True
-                    cover = Image.open(io.BytesIO(r.content))
+                    cover = open_artwork(io.BytesIO(r.content),
+                                         thumb_width, thumb_height)
                     image_set = True
                     resize_needed = True
                     _last_image_time = new_image_time
                     _image_default = False
                 except BaseException:
-                    cover = Image.open(_default_airplay_thumb)
+                    cover = default_artwork(_default_airplay_thumb,
+                                            thumb_width, thumb_height, enlarge)
                     prev_image = cover
                     image_set = True
-                    resize_needed = True
                     _image_default = True
         else:
             image_set = True
 
     # We proceed through this code only when running local to Kodi
     if not image_set:
-        if _airtunes_re.match(cover_path):
-            airplay_thumb = "/storage/.kodi/temp/" + \
-                _airtunes_re.match(cover_path).group(1)
+        airtunes_match = match_airtunes(cover_path)
+        if airtunes_match:
+            airplay_thumb = "/storage/.kodi/temp/" + airtunes_match.group(1)
             if os.path.isfile(airplay_thumb):
-                _last_image_path = airplay_thumb
-                _image_default   = False
-                resize_needed    = True
+                with open(airplay_thumb, "rb") as f:
+                    data = f.read()
+                digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+                thumb_key = (digest, thumb_width, thumb_height, enlarge)
+                _image_default = False
+
+                cover = _airplay_thumbs.get(thumb_key)
+                cache_path = None
+                if (cover is None and ARTWORK_CACHE_DIR):
+                    cache_path = artwork_cache_path("airtunes:" + digest,
+                                                    thumb_width, thumb_height,
+                                                    enlarge)
+                    cover = load_cached_artwork(cache_path)
+                if cover is None:
+                    cover = open_artwork(io.BytesIO(data),
+                                         thumb_width, thumb_height)
+                    cover = resize_artwork(cover, thumb_width, thumb_height,
+                                           enlarge)
+                    if cache_path:
+                        save_cached_artwork(cover, cache_path)
+
+                if thumb_key not in _airplay_thumbs:
+                    if len(_airplay_thumbs) >= _AIRPLAY_THUMBS_MAX:
+                        _airplay_thumbs.clear()
+                    _airplay_thumbs[thumb_key] = cover
+                return cover
             else:
-                _last_image_path = _default_airplay_thumb
-                _image_default   = True
-                resize_needed    = True
-
-            cover = Image.open(_last_image_path)
-            prev_image = cover
-            image_set  = True
+                _image_default = True
+                cover = default_artwork(_default_airplay_thumb,
+                                        thumb_width, thumb_height, enlarge)
+                prev_image = cover
+                image_set  = True
 
     # is resizing needed?
     if (image_set and resize_needed):
-        if (enlarge and (cover.size[0] < thumb_width or
-                         cover.size[1] < thumb_height)):
-
-            # Figure out which dimension is the constraint
-            # for maintenance of the aspect ratio
-            width_enlarge  = thumb_width / float(cover.size[0])
-            height_enlarge = thumb_height / float(cover.size[1])
-            ratio = min( width_enlarge, height_enlarge )
-
-            new_width  = int( cover.size[0] * ratio )
-            new_height = int( cover.size[1] * ratio )
-            cover = cover.resize((new_width, new_height))
-
-        else:
-            # reduce while maintaining aspect ratio, which should
-            # be precisely what thumbnail accomplishes
-            cover.thumbnail((thumb_width, thumb_height))
+        cover = resize_artwork(cover, thumb_width, thumb_height, enlarge)
 
         prev_image = cover
 
@@ -1494,6 +1913,71 @@ def get_airplay_art(cover_path, prev_image, thumb_width, thumb_height, enlarge=F
 
 
 
+# Download URLs provided by Files.PrepareDownload, keyed by Kodi's
+# artwork path.  These are stable for a given path, so the same cover
+# needed at another size (or again after falling out of get_artwork's
+# cache) can skip that JSON-RPC round trip.  Only URLs that led to a
+# successful retrieval get remembered.
+_download_urls = {}
+
+
+# Path within ARTWORK_CACHE_DIR for the given artwork at the given
+# size, using a hash of the Kodi-provided path as the file name.
+def artwork_cache_path(cover_path, thumb_width, thumb_height, enlarge):
+    key = hashlib.blake2b(cover_path.encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(
+        ARTWORK_CACHE_DIR,
+        "%s_%dx%d%s.png" % (key, thumb_width, thumb_height, "e" if enlarge else ""))
+
+
+# Load previously-cached artwork, returning None if it is absent or
+# unreadable.  The file's times are updated so that pruning discards
+# the least-recently used entries.
+def load_cached_artwork(cache_path):
+    try:
+        cover = Image.open(cache_path)
+        cover.load()
+        os.utime(cache_path)
+        return cover
+    except (OSError, ValueError):
+        return None
+
+
+# Save resized artwork to the cache, pruning the oldest entries once
+# there are more than ARTWORK_CACHE_SIZE files.  Failure to write the
+# cache is not considered an error.
+#
+# The file is written under a temporary name and then renamed into
+# place, so that a concurrent reader (or writer, with artwork prefetch
+# enabled) never sees a partially written PNG.
+def save_cached_artwork(cover, cache_path):
+    tmp_path = None
+    try:
+        if cover.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+            cover = cover.convert("RGB")
+        (fd, tmp_path) = tempfile.mkstemp(dir=ARTWORK_CACHE_DIR,
+                                          suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp_file:
+            cover.save(tmp_file, "PNG")
+        os.replace(tmp_path, cache_path)
+        tmp_path = None
+
+        entries = [os.path.join(ARTWORK_CACHE_DIR, name)
+                   for name in os.listdir(ARTWORK_CACHE_DIR)
+                   if name.endswith(".png")]
+        if len(entries) > ARTWORK_CACHE_SIZE:
+            entries.sort(key=os.path.getmtime)
+            for old_path in entries[0:len(entries) - ARTWORK_CACHE_SIZE]:
+                os.remove(old_path)
+    except (OSError, ValueError):
+        if DEBUG_ART: print("Unable to cache artwork at ", cache_path) # debug info
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
 # Retrieve cover art or a default thumbnail.  Cover art gets resized
 # to the provided thumb_width and thumb_height.  (This now applies
 # to default images as well.)
@@ -1522,18 +2006,31 @@ def get_airplay_art(cover_path, prev_image, thumb_width, thumb_height, enlarge=F
 #  enlarge       boolean indicating if artwork should be enlarged
 #                 if smaller than the specified width and height
 #
-@lru_cache(maxsize=18)
+# If ARTWORK_CACHE_DIR is set, the on-disk cache is consulted before
+# asking Kodi for anything.
+#
+@lru_cache(maxsize=32)
 def get_artwork(cover_path, thumb_width, thumb_height, use_defaults=False, enlarge=False):
     image_url = None
     image_set = False
     resize_needed = False
+    retrieved = False
+    cache_path = None
 
     cover = None  # used for retrieved artwork, original size
 
     if (cover_path != '' and
         (not cover_path.startswith('DefaultVideoCover')) and
         (not cover_path.startswith('DefaultAlbumCover')) and
-        (not _airtunes_re.match(cover_path))):
+        (not is_airtunes(cover_path))):
+
+        if ARTWORK_CACHE_DIR:
+            cache_path = artwork_cache_path(cover_path, thumb_width,
+                                            thumb_height, enlarge)
+            cover = load_cached_artwork(cache_path)
+            if cover:
+                if DEBUG_ART: print("cached artwork : ", cache_path) # debug info
+                return cover
 
         image_path = cover_path
         if DEBUG_ART: print("image_path : ", image_path) # debug info
@@ -1541,6 +2038,8 @@ def get_artwork(cover_path, thumb_width, thumb_height, use_defaults=False, enlar
         if (image_path.startswith("http://") or
             image_path.startswith("https://")):
             image_url = image_path
+        elif image_path in _download_urls:
+            image_url = _download_urls[image_path]
         else:
             payload = {
                 "jsonrpc": "2.0",
@@ -1548,8 +2047,7 @@ def get_artwork(cover_path, thumb_width, thumb_height, use_defaults=False, enlar
                 "params": {"path": image_path},
                 "id": 5,
             }
-            response = requests.post(
-                rpc_url, data=json.dumps(payload), headers=headers).json()
+            response = kodi_rpc(json_dumps(payload))
             if DEBUG_ART:
                 print("PrepareDownload Response: ", json.dumps(response))  # debug info
 
@@ -1560,16 +2058,25 @@ def get_artwork(cover_path, thumb_width, thumb_height, use_defaults=False, enlar
             except BaseException:
                 pass
 
-        r = requests.get(image_url, stream=True)
+        r = _session.get(image_url, stream=True, timeout=RPC_TIMEOUT)
         # check that the retrieval was successful before proceeding
         if r.status_code == 200:
             try:
-                r.raw.decode_content = True
-                cover = Image.open(io.BytesIO(r.content))
+                # Image.open() needs a seekable file, so the body is
+                # read in full either way; r.content is that one copy
+                cover = open_artwork(io.BytesIO(r.content),
+                                     thumb_width, thumb_height)
                 image_set = True
                 resize_needed = True
+                retrieved = True
+                if image_url != image_path:
+                    if len(_download_urls) >= 256:
+                        _download_urls.clear()
+                    _download_urls[image_path] = image_url
             except BaseException:
                 image_set = False
+        else:
+            _download_urls.pop(image_path, None)
 
     # use default images if we haven't retrieved anything
     if (not image_set and use_defaults):
@@ -1580,31 +2087,82 @@ def get_artwork(cover_path, thumb_width, thumb_height, use_defaults=False, enlar
         else:
             default_path = _default_audio_thumb
 
-        cover = Image.open(default_path)
-        image_set = True
-        resize_needed = True
+        return default_artwork(default_path, thumb_width, thumb_height, enlarge)
 
     if (image_set and resize_needed):
+        cover = resize_artwork(cover, thumb_width, thumb_height, enlarge)
 
-        if (enlarge and (cover.size[0] < thumb_width or
-                         cover.size[1] < thumb_height)):
+        # Only artwork actually retrieved from Kodi gets cached
+        if (cache_path and retrieved):
+            save_cached_artwork(cover, cache_path)
 
-            # Figure out which dimension is the constraint
-            # for maintenance of the aspect ratio
-            width_enlarge  = thumb_width / float(cover.size[0])
-            height_enlarge = thumb_height / float(cover.size[1])
-            ratio = min( width_enlarge, height_enlarge )
+    return cover
 
-            new_width  = int( cover.size[0] * ratio )
-            new_height = int( cover.size[1] * ratio )
-            cover = cover.resize((new_width, new_height))
 
-        else:
-            # reduce while maintaining aspect ratio, which should
-            # be precisely what thumbnail accomplishes
-            cover.thumbnail((thumb_width, thumb_height))
+# Warm get_artwork()'s cache for cover_path on the artwork thread.
+# The arguments must be passed exactly as audio_screen_static() passes
+# them, as lru_cache distinguishes positional from keyword arguments.
+# Should the fetch raise, nothing is cached and the later foreground
+# call simply tries again.
+def prefetch_artwork(cover_path, thumb_width, thumb_height, enlarge=False):
+    global _artwork_executor
+    if (not cover_path or is_airtunes(cover_path)):
+        return
+    if _artwork_executor is None:
+        _artwork_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    _artwork_executor.submit(get_artwork, cover_path,
+                             thumb_width, thumb_height,
+                             use_defaults=True, enlarge=enlarge)
 
-    return cover
+
+
+# Return a full-frame Image containing a layout's background, as
+# specified by its (optional) background table:
+#
+#   rectangle  Boolean requesting a drawn rectangle, using the
+#                fill, outline, and width keys
+#   image      Path to an image file, assumed to be properly sized
+#                for the display
+#   fill       Background color
+#
+# Backgrounds are rendered once and then retained, keyed by the
+# layout's background table, so that screens need only paste the
+# result.  Callers must NOT draw into the returned Image.
+#
+# The status and slideshow screens have historically drawn a plain
+# fill with a 1-pixel black outline; fill_outline preserves that.
+#
+_backgrounds = {}
+
+def layout_background(layout, fill_outline=False):
+    bg_dict = layout.get("background", {})
+    cache_key = (id(bg_dict), fill_outline)
+    if cache_key in _backgrounds:
+        return _backgrounds[cache_key]
+
+    if bg_dict.get("rectangle", False):
+        frame = Image.new('RGB', (_frame_size), 'black')
+        ImageDraw.Draw(frame).rectangle(
+            [(0, 0), (_frame_size[0], _frame_size[1])],
+            fill    = bg_dict.get("fill","black"),
+            outline = bg_dict.get("outline","black"),
+            width   = bg_dict.get("width",1)
+        )
+    else:
+        frame = Image.new('RGB', (_frame_size), bg_dict.get("fill","black"))
+        if ("image" in bg_dict and
+            os.path.isfile(bg_dict["image"]) and
+            os.access(bg_dict["image"], os.R_OK)):
+            frame.paste(Image.open(bg_dict["image"]), (0,0))
+        elif ("fill" in bg_dict and fill_outline):
+            ImageDraw.Draw(frame).rectangle(
+                [(0, 0), (_frame_size[0], _frame_size[1])],
+                outline = "black",
+                width   = 1
+            )
+
+    _backgrounds[cache_key] = frame
+    return frame
 
 
 
@@ -1694,10 +2252,10 @@ def format_InfoLabels(orig_str, kodi_info, screen_mode=None, layout_name=""):
     matches = set(_InfoLabel_re.findall(orig_str))
     new_str = orig_str
     for field in matches:
-        if field in kodi_info.keys():
+        if field in kodi_info:
             # lookup substitution using InfoLabels
             new_str = new_str.replace('{' + field + '}', kodi_info[field])
-        elif field in STRING_CB.keys():
+        elif field in STRING_CB:
             # lookup substitution from string-manipulation callbacks
             new_str = new_str.replace('{' + field + '}',
                                       STRING_CB[field](
@@ -1826,13 +2384,26 @@ def draw_fields(image, draw, layout, info,
 
     # Pull out the layout's array of fields
     field_list = layout.get("fields", [])
+    default_fontmode = draw.fontmode
+
+    # Module-level tables consulted for every field, bound locally
+    element_cb = ELEMENT_CB
+    string_cb  = STRING_CB
+    static_screen = (screen_mode == ScreenMode.STATUS or
+                     screen_mode == ScreenMode.SLIDE)
+
     for field_dict in field_list:
         display_string = None
 
         if DEBUG_FIELDS:
             print("Examining field: ", field_dict)
 
-        if "anchor" in field_dict.keys():
+        # Fields can request text rendering without antialiasing,
+        # which is cheaper and loses nothing for segmented LCD-style
+        # fonts drawn in a single color.
+        draw.fontmode = "1" if field_dict.get("aliased", False) else default_fontmode
+
+        if "anchor" in field_dict:
             anchor_pos = field_dict["anchor"]
         else:
             anchor_pos = "la"
@@ -1844,8 +2415,7 @@ def draw_fields(image, draw, layout, info,
         # Just show everything for a STATUS screen or
         # a SLIDE screen.
 
-        if (screen_mode == ScreenMode.STATUS or
-            screen_mode == ScreenMode.SLIDE):
+        if static_screen:
             pass
         else:
             if dynamic:
@@ -1869,8 +2439,9 @@ def draw_fields(image, draw, layout, info,
         # exists in the lookup table, invoke the specified function
         # with all of the arguments discussed in earlier comments.
 
-        if field_dict["name"] in ELEMENT_CB:
-            display_string = ELEMENT_CB[field_dict["name"]](
+        name = field_dict["name"]
+        if name in element_cb:
+            display_string = element_cb[name](
                 image,             # Image instance
                 draw,              # ImageDraw instance
                 info,              # Kodo InfoLabel response
@@ -1887,8 +2458,8 @@ def draw_fields(image, draw, layout, info,
                                   display_string +
                                   field_dict.get("suffix", ""))
 
-        elif field_dict["name"] in STRING_CB:
-            display_string = STRING_CB[field_dict["name"]](
+        elif name in string_cb:
+            display_string = string_cb[name](
                 info,              # Kodo InfoLabel response
                 screen_mode,       # screen mode, as enum
                 layout_name        # layout name, as string
@@ -1903,18 +2474,20 @@ def draw_fields(image, draw, layout, info,
                                   field_dict.get("suffix", ""))
 
         else:
+            # Single lookup; None means the InfoLabel is absent
+            value = info.get(name)
             if (# name corresponds to a non-empty InfoLabel -OR-
-                (field_dict["name"] in info and info[field_dict["name"]] != "") or
+                value or
                 # entry has a format_str specified for use
-                ("format_str" in field_dict)):
+                "format_str" in field_dict):
 
                 # use format_str or prefix/suffic approach, in that order
                 if field_dict.get("format_str", ""):
                     display_string = format_InfoLabels(
                         field_dict["format_str"], info, screen_mode, layout_name)
-                elif field_dict["name"] in info:
+                elif value is not None:
                     display_string = (field_dict.get("prefix", "") +
-                                      info[field_dict["name"]] +
+                                      value +
                                       field_dict.get("suffix", ""))
 
 
@@ -1934,34 +2507,38 @@ def draw_fields(image, draw, layout, info,
 
         # render any label first
         if "label" in field_dict:
-            draw.text((field_dict["lposx"], field_dict["lposy"]),
+            draw_text(image, draw,
+                      field_dict["lpos"],
                       field_dict["label"],
                       fill=field_dict["lfill"], font=field_dict["lfont"])
 
-        if "wrap" in field_dict.keys():
+        if "wrap" in field_dict:
             render_text_wrap(draw,
-                             (field_dict["posx"], field_dict["posy"]),
+                             field_dict["pos"],
                              display_string,
                              max_width=field_dict["max_width"],
                              max_lines=field_dict["max_lines"],
                              fill=field_dict["fill"],
-                             font=field_dict["font"])
-        elif "trunc" in field_dict.keys():
+                             font=field_dict["font"],
+                             image=image)
+        elif "trunc" in field_dict:
             render_text_wrap(draw,
-                             (field_dict["posx"], field_dict["posy"]),
+                             field_dict["pos"],
                              display_string,
-                             max_width=_frame_size[0] -
-                             field_dict["posx"],
+                             max_width=field_dict["trunc_width"],
                              max_lines=1,
                              fill=field_dict["fill"],
-                             font=field_dict["font"])
+                             font=field_dict["font"],
+                             image=image)
         else:
-            draw.text((field_dict["posx"], field_dict["posy"]),
+            draw_text(image, draw,
+                      field_dict["pos"],
                       display_string,
                       fill=field_dict["fill"],
                       font=field_dict["font"],
                       anchor=anchor_pos)
 
+    draw.fontmode = default_fontmode
 
 
 # Callback hook for status/info selection
@@ -1997,6 +2574,34 @@ STATUS_SELECT_FUNC = None
 # So, the background fill (if any) is handled in a slightly different
 # manner.
 #
+# Return the background for a status screen layout, with the Kodi logo
+# already pasted in place if the layout has a thumb entry.  The logo
+# never changes, so it gets opened and resized just once per layout
+# rather than on every update.  As with layout_background(), callers
+# must NOT draw into the returned Image.
+_status_backgrounds = {}
+
+def status_background(layout):
+    if id(layout) in _status_backgrounds:
+        return _status_backgrounds[id(layout)]
+
+    frame = layout_background(layout, fill_outline=True)
+    if "thumb" in layout:
+        thumb_dict = layout["thumb"]
+        kodi_icon = resize_artwork(Image.open(_kodi_thumb),
+                                   thumb_dict["size"], thumb_dict["size"],
+                                   thumb_dict.get("enlarge", False))
+
+        frame = frame.copy()
+        frame.paste(
+            kodi_icon,
+            (thumb_dict["posx"],
+             thumb_dict["posy"]))
+
+    _status_backgrounds[id(layout)] = frame
+    return frame
+
+
 def status_screen(image, draw, kodi_status):
     global info_dmode
 
@@ -2011,59 +2616,12 @@ def status_screen(image, draw, kodi_status):
         info_dmode = None
         layout = STATUS_LAYOUT
 
-    # Draw any user-specified rectangle or load background
-    # image for layout
-    if "background" in layout:
-        if ("rectangle" in layout["background"] and
-            layout["background"]["rectangle"]):
-            draw.rectangle(
-                [(0, 0), (_frame_size[0], _frame_size[1])],
-                fill    = layout["background"].get("fill","black"),
-                outline = layout["background"].get("outline","black"),
-                width   = layout["background"].get("width",1)
-            )
-
-        elif ("image" in layout["background"] and
-              os.path.isfile(layout["background"]["image"]) and
-              os.access(layout["background"]["image"], os.R_OK)):
-            # assume that image is properly sized for the display
-            bg_image = Image.open(layout["background"]["image"])
-            image.paste(bg_image, (0,0))
-
-        elif ("fill" in layout["background"]):
-            draw.rectangle(
-                [(0, 0), (_frame_size[0], _frame_size[1])],
-                fill    = layout["background"].get("fill","black"),
-                outline = "black",
-                width   = 1
-            )
-
-    # Kodi logo, if desired
-    if "thumb" in layout.keys():
-        thumb_dict = layout["thumb"]
-        kodi_icon = Image.open(_kodi_thumb)
-
-        if (thumb_dict.get("enlarge", False) and
-            (kodi_icon.size[0] < thumb_dict["size"] or
-             kodi_icon.size[1] < thumb_dict["size"])):
-            width_enlarge  = thumb_dict["size"] / float(kodi_icon.size[0])
-            height_enlarge = thumb_dict["size"] / float(kodi_icon.size[1])
-            ratio = min( width_enlarge, height_enlarge )
-
-            new_width  = int( kodi_icon.size[0] * ratio )
-            new_height = int( kodi_icon.size[1] * ratio )
-            kodi_icon = kodi_icon.resize((new_width, new_height))
-
-        else:
-            kodi_icon.thumbnail((thumb_dict["size"], thumb_dict["size"]))
-
-        image.paste(
-            kodi_icon,
-            (thumb_dict["posx"],
-             thumb_dict["posy"]))
+    # Start from the layout's pre-rendered background, which already
+    # includes the Kodi logo (if desired)
+    image.paste(status_background(layout), (0, 0))
 
     # go through all layout fields, if any
-    if "fields" not in layout.keys():
+    if "fields" not in layout:
         return
 
     draw_fields(image, draw,
@@ -2080,36 +2638,11 @@ def status_screen(image, draw, kodi_status):
 def audio_screen_static(layout, info):
     global _last_thumb
 
-    # Create new Image and ImageDraw objects
-    if ("background" in layout and
-        "fill" in layout["background"] and
-        ("rectangle" not in layout["background"] or
-         not layout["background"]["rectangle"])):
-        image = Image.new('RGB', (_frame_size), layout["background"]["fill"])
-    else:
-        image = Image.new('RGB', (_frame_size), 'black')
-
+    # Create new Image and ImageDraw objects, starting from the
+    # layout's pre-rendered background
+    image = layout_background(layout).copy()
     draw = ImageDraw.Draw(image)
 
-    # Draw any user-specified rectangle or load background
-    # image for layout
-    if "background" in layout:
-        if ("rectangle" in layout["background"] and
-            layout["background"]["rectangle"]):
-            draw.rectangle(
-                [(0, 0), (_frame_size[0], _frame_size[1])],
-                fill    = layout["background"].get("fill","black"),
-                outline = layout["background"].get("outline","black"),
-                width   = layout["background"].get("width",1)
-            )
-
-        elif ("image" in layout["background"] and
-              os.path.isfile(layout["background"]["image"]) and
-              os.access(layout["background"]["image"], os.R_OK)):
-            # assume that image is properly sized for the display
-            bg_image = Image.open(layout["background"]["image"])
-            image.paste(bg_image, (0,0))
-
 
     # Mimic the display conditional functionality that is provided for
     # entries in the fields array of a layout, but applied here to
@@ -2121,7 +2654,7 @@ def audio_screen_static(layout, info):
     show_thumb = False
     thumb_dict = {}
 
-    if "thumb" in layout.keys():
+    if "thumb" in layout:
         show_thumb = True
         thumb_dict = layout["thumb"]
 
@@ -2155,7 +2688,7 @@ def audio_screen_static(layout, info):
     # needs a refresh.  AirPlay cover art must be handled specially.
     if show_thumb:
 
-        if _airtunes_re.match(info['MusicPlayer.Cover']):
+        if is_airtunes(info['MusicPlayer.Cover']):
             _last_thumb = get_airplay_art(info['MusicPlayer.Cover'], _last_thumb,
                                           width, height,
                                           enlarge=thumb_dict.get("enlarge", False))
@@ -2165,6 +2698,12 @@ def audio_screen_static(layout, info):
                                       use_defaults=True,
                                       enlarge=thumb_dict.get("enlarge", False))
 
+            # Get a head start on the next track's cover
+            if PREFETCH_ARTWORK:
+                prefetch_artwork(info.get('MusicPlayer.Offset(1).Cover', ""),
+                                 width, height,
+                                 enlarge=thumb_dict.get("enlarge", False))
+
 
         if _last_thumb:
             paste_artwork(image, _last_thumb, thumb_dict)
@@ -2200,7 +2739,7 @@ def audio_screen_dynamic(image, draw, layout, info, prog):
     show_prog = False
     prog_dict = {}
 
-    if (prog == -1 or "prog" not in layout.keys()):
+    if (prog == -1 or "prog" not in layout):
         show_prog = False
     else:
         show_prog = True
@@ -2281,8 +2820,9 @@ AUDIO_SELECT_FUNC = audio_select_default
 #
 
 def audio_screens(image, draw, info):
-    global _static_image, _static_video
+    global _static_image, _static_video, _static_layout
     global _last_track_num, _last_track_title, _last_track_album, _last_track_time
+    global _last_track_cover
     global _last_thumb
     global audio_dmode
 
@@ -2301,15 +2841,19 @@ def audio_screens(image, draw, info):
     )
 
     if (_static_image and (not _static_video) and
+        layout is _static_layout and
         info["MusicPlayer.TrackNumber"] == _last_track_num and
         info["MusicPlayer.Title"] == _last_track_title and
         info["MusicPlayer.Album"] == _last_track_album and
+        info.get("MusicPlayer.Cover") == _last_track_cover and
             info["MusicPlayer.Duration"] == _last_track_time):
         pass
     else:
         _last_thumb = None
         _static_image = audio_screen_static(layout, info)
         _static_video = False
+        _static_layout = layout
+        _last_track_cover = info.get("MusicPlayer.Cover")
         _last_track_num = info["MusicPlayer.TrackNumber"]
         _last_track_title = info["MusicPlayer.Title"]
         _last_track_album = info["MusicPlayer.Album"]
@@ -2325,36 +2869,11 @@ def audio_screens(image, draw, info):
 def video_screen_static(layout, info):
     global _last_thumb
 
-    # Create new Image and ImageDraw objects
-    if ("background" in layout and
-        "fill" in layout["background"] and
-        ("rectangle" not in layout["background"] or
-         not layout["background"]["rectangle"])):
-        image = Image.new('RGB', (_frame_size), layout["background"]["fill"])
-    else:
-        image = Image.new('RGB', (_frame_size), 'black')
-
+    # Create new Image and ImageDraw objects, starting from the
+    # layout's pre-rendered background
+    image = layout_background(layout).copy()
     draw = ImageDraw.Draw(image)
 
-    # Draw any user-specified rectangle or load background
-    # image for layout
-    if "background" in layout:
-        if ("rectangle" in layout["background"] and
-            layout["background"]["rectangle"]):
-            draw.rectangle(
-                [(0, 0), (_frame_size[0], _frame_size[1])],
-                fill    = layout["background"].get("fill","black"),
-                outline = layout["background"].get("outline","black"),
-                width   = layout["background"].get("width",1)
-            )
-
-        elif ("image" in layout["background"] and
-              os.path.isfile(layout["background"]["image"]) and
-              os.access(layout["background"]["image"], os.R_OK)):
-            # assume that image is properly sized for the display
-            bg_image = Image.open(layout["background"]["image"])
-            image.paste(bg_image, (0,0))
-
 
     # Mimic the display conditional functionality that is provided for
     # entries in the fields array of a layout, but applied here to
@@ -2366,7 +2885,7 @@ def video_screen_static(layout, info):
     show_thumb = False
     thumb_dict = {}
 
-    if "thumb" in layout.keys():
+    if "thumb" in layout:
         show_thumb = True
         thumb_dict = layout["thumb"]
 
@@ -2419,7 +2938,7 @@ def video_screen_dynamic(image, draw, layout, info, prog):
     show_prog = False
     prog_dict = {}
 
-    if (prog == -1 or "prog" not in layout.keys()):
+    if (prog == -1 or "prog" not in layout):
         show_prog = False
     else:
         show_prog = True
@@ -2510,7 +3029,7 @@ VIDEO_SELECT_FUNC = video_select_default
 #  See static/dynamic description given for audio_screens()
 #
 def video_screens(image, draw, info):
-    global _static_image, _static_video
+    global _static_image, _static_video, _static_layout
     global _last_video_title, _last_video_episode, _last_video_time
     global video_dmode
 
@@ -2529,6 +3048,7 @@ def video_screens(image, draw, info):
     )
 
     if (_static_image and _static_video and
+        layout is _static_layout and
         info["VideoPlayer.Title"] == _last_video_title and
         info["VideoPlayer.Episode"] == _last_video_episode and
             info["VideoPlayer.Duration"] == _last_video_time):
@@ -2536,6 +3056,7 @@ def video_screens(image, draw, info):
     else:
         _static_image = video_screen_static(layout, info)
         _static_video = True
+        _static_layout = layout
         _last_video_title = info["VideoPlayer.Title"]
         _last_video_episode = info["VideoPlayer.Episode"]
         _last_video_time = info["VideoPlayer.Duration"]
@@ -2580,35 +3101,11 @@ def slideshow_screens(image, draw, info):
     # Retrieve layout details
     layout = SLIDESHOW_LAYOUT[slide_dmode.name]
 
-    # Draw any user-specified rectangle or load background
-    # image for layout
-    if "background" in layout:
-        if ("rectangle" in layout["background"] and
-            layout["background"]["rectangle"]):
-            draw.rectangle(
-                [(0, 0), (_frame_size[0], _frame_size[1])],
-                fill    = layout["background"].get("fill","black"),
-                outline = layout["background"].get("outline","black"),
-                width   = layout["background"].get("width",1)
-            )
-
-        elif ("image" in layout["background"] and
-              os.path.isfile(layout["background"]["image"]) and
-              os.access(layout["background"]["image"], os.R_OK)):
-            # assume that image is properly sized for the display
-            bg_image = Image.open(layout["background"]["image"])
-            image.paste(bg_image, (0,0))
-
-        elif ("fill" in layout["background"]):
-            draw.rectangle(
-                [(0, 0), (_frame_size[0], _frame_size[1])],
-                fill    = layout["background"].get("fill","black"),
-                outline = "black",
-                width   = 1
-            )
+    # Start from the layout's pre-rendered background
+    image.paste(layout_background(layout, fill_outline=True), (0, 0))
 
     # go through all layout fields, if any
-    if "fields" not in layout.keys():
+    if "fields" not in layout:
         return
 
     draw_fields(image, draw,
@@ -2677,24 +3174,202 @@ def calc_progress(time_str, duration_str, layout_name):
 # enabled.  Note that scripts using hardware PWM on RPi are likely to
 # override this function.
 #
+# As with the PWM versions in kodi_panel_fb.py, the backlight state is
+# tracked so that luma (and the display's bus) only gets involved
+# when the state actually changes.
+#
+_backlight_state = None
+
 def screen_on():
-    if (not USE_BACKLIGHT or DEMO_MODE):
+    global _backlight_state
+    if (not USE_BACKLIGHT or DEMO_MODE or _backlight_state == 1):
         return
     if USE_PWM:
         device.backlight(PWM_LEVEL)
     else:
         device.backlight(True)
+    _backlight_state = 1
 
 # Turn off the display backlight, making use of luma's PWM
 # capabilities if enabled.  Note that scripts using hardware PWM on
 # RPi are likely to override this function.
 #
 def screen_off():
-    if (not USE_BACKLIGHT or DEMO_MODE):
+    global _backlight_state
+    if (not USE_BACKLIGHT or DEMO_MODE or _backlight_state == 0):
         return
     if USE_PWM:
         device.backlight(0)
     device.backlight(False)
+    _backlight_state = 0
+
+
+# Construct the batch JSON-RPC payload retrieving InfoLabels and, if
+# any are defined, InfoBooleans.  The argument is a key into the
+# _INFO_REQUESTS table.
+def info_payload(info_key):
+    (labels, booleans, id_str) = _INFO_REQUESTS[info_key]
+    payload = [{ "jsonrpc": "2.0",
+                 "method": "XBMC.GetInfoLabels",
+                 "params": {"labels": labels},
+                 "id": id_str }]
+    if len(booleans):
+        payload += [{ "jsonrpc": "2.0",
+                      "method": "XBMC.GetInfoBooleans",
+                      "params": {"booleans": booleans},
+                      "id": id_str + "i" }]
+    return payload
+
+
+# Serialized form of the batch JSON-RPC payload for info_key (which may
+# be None), optionally preceded by a GetActivePlayers call.  These
+# payloads never change once kodi_panel is running, so each is
+# serialized just once.
+@lru_cache(maxsize=None)
+def encoded_payload(info_key, with_players=False):
+    payload = []
+    if with_players:
+        payload.append(_ACTIVE_PLAYERS)
+    if info_key:
+        payload += info_payload(info_key)
+    return json_dumps(payload)
+
+
+# Convert a batch JSON-RPC response (a list) into a dictionary keyed
+# by the id of each call.  Kodi replies with a single object, rather
+# than a list, if the batch as a whole could not be processed.
+def batch_results(response):
+    if type(response) != list:
+        response = [response]
+    return { item.get('id') : item for item in response }
+
+
+# Ensure that the results dictionary contains the responses needed for
+# the info_key entry of _INFO_REQUESTS, issuing another RPC call only
+# if update_display() did not already receive them as part of its
+# batch request.
+def request_info(info_key, results):
+    id_str = _INFO_REQUESTS[info_key][2]
+    if id_str not in results:
+        response = kodi_rpc(encoded_payload(info_key))
+        results.update(batch_results(response))
+
+
+# Merge the InfoLabel and InfoBoolean results for info_key into a
+# single dictionary, as expected by all of the screen functions.
+def merge_info(info_key, results):
+    (labels, booleans, id_str) = _INFO_REQUESTS[info_key]
+    info = results[id_str]['result']
+    if len(booleans):
+        info.update(results[id_str + "i"]['result'])
+    return info
+
+
+# Display thread target.  Any failure of the display update is
+# reported, but does not stop the thread.
+def display_worker():
+    while True:
+        frame = _display_queue.get()
+        try:
+            device.display(frame)
+        except BaseException:
+            print(datetime.now(), "Display update failed: ", sys.exc_info()[0])
+            print(traceback.format_exc())
+        _free_buffers.put(frame)
+        _display_queue.task_done()
+
+
+# Send a frame to the OLED/LCD display or framebuffer, either directly
+# or via the display thread.  In the latter case the frame is pasted
+# into one of the handoff buffers, as the caller is free to keep
+# drawing into the passed image.
+def display_image(frame):
+    if _display_thread is None:
+        device.display(frame)
+        return
+
+    # Reclaim any frame that the thread has not yet picked up;
+    # otherwise, the other buffer is (or is about to be) free.
+    try:
+        buffer = _display_queue.get_nowait()
+        _display_queue.task_done()
+    except queue.Empty:
+        buffer = _free_buffers.get()
+    buffer.paste(frame, (0, 0))
+    _display_queue.put_nowait(buffer)
+
+
+# Notification thread target.  Kodi's TCP interface sends a stream of
+# JSON objects with nothing between them, so raw_decode() peels off
+# each complete object as it arrives.  Player, GUI, and Application
+# notifications wake the main loop.  Should the connection fail, the
+# thread just tries again later; polling carries on regardless.
+#
+# The connection can sit idle indefinitely, so TCP keepalive is what
+# notices a Kodi host that vanished without closing it (a reboot or
+# dropped wifi).  A blocked recv() then fails and the thread
+# reconnects.  Where the platform permits, probing starts after 30
+# seconds of silence, giving up after three unanswered probes.
+def notify_keepalive(sock):
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    for (option, value) in (("TCP_KEEPIDLE", 30),
+                            ("TCP_KEEPINTVL", 10),
+                            ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, option):
+            sock.setsockopt(socket.IPPROTO_TCP,
+                            getattr(socket, option), value)
+
+
+def notify_worker():
+    host = urlsplit(base_url).hostname
+    decoder = json.JSONDecoder()
+    last_wake = 0
+    while True:
+        try:
+            with socket.create_connection((host, KODI_NOTIFY_PORT),
+                                          timeout=5) as sock:
+                notify_keepalive(sock)
+                sock.settimeout(None)
+                print(datetime.now(), "Listening for Kodi notifications")
+                utf8 = codecs.getincrementaldecoder("utf-8")("replace")
+                buf = ""
+                while True:
+                    data = sock.recv(4096)
+                    if not data:
+                        break
+                    buf = (buf + utf8.decode(data)).lstrip()
+                    while buf:
+                        try:
+                            (msg, end) = decoder.raw_decode(buf)
+                        except ValueError:
+                            # incomplete object, unless runaway
+                            if len(buf) > 65536:
+                                buf = ""
+                            break
+                        buf = buf[end:].lstrip()
+                        if (isinstance(msg, dict) and
+                            str(msg.get("method", "")).startswith(_NOTIFY_PREFIXES)):
+                            now = time.monotonic()
+                            if now - last_wake >= _NOTIFY_MIN_INTERVAL:
+                                last_wake = now
+                                _kodi_wake.set()
+        except OSError:
+            pass
+        time.sleep(5)
+
+
+# Determine whether the frame described by frame_key, a tuple of the
+# screen type, the layout in use, and the info dictionary retrieved
+# from Kodi, matches what update_display() last rendered.  If so, the
+# image is already correct and both the render and the (often slow)
+# display update can be skipped.
+#
+# Never skipped with the pygame emulator, which only services its
+# window (and keyboard) from within device.display().
+def same_frame(frame_key):
+    return (SKIP_UNCHANGED_FRAMES and not DEMO_MODE and
+            frame_key is not None and
+            frame_key == _last_frame_key)
 
 
 # Kodi-polling and image rendering function
@@ -2706,22 +3381,22 @@ def screen_off():
 # a direct update.
 #
 def update_display():
-    global _kodi_playing
+    global _kodi_playing, _prefetch_info, _last_frame_key
     global _last_thumb, _static_image
     global _screen_press, _screen_active, _screen_offtime
     global audio_dmode, video_dmode
 
     _lock.acquire()
+    frame_key = None
 
     # Start with a blank slate, if there's no static image
     if (not (_kodi_connected and _static_image)):
-        draw.rectangle(
-            [(0, 0), (_frame_size[0], _frame_size[1])], 'black', 'black')
+        image.paste(_blank_frame, (0, 0))
 
     # Check if the _screen_active time has expired, unless we're
     # always showing an idle status screen.
     if not IDLE_STATUS_ENABLED:
-        if (_screen_active and datetime.now() >= _screen_offtime):
+        if (_screen_active and time.monotonic() >= _screen_offtime):
             _screen_active = False
             if not _kodi_playing:
                 screen_off()
@@ -2736,24 +3411,30 @@ def update_display():
     #   and InfoBooleans together.
     #
     #   Nevertheless, at this point in the flow we do not yet know
-    #   Kodi's state.  Unless we wish to make a "blind" call and
-    #   ask for *every* InfoLabel and every InfoBoolean of possible
-    #   interest, we must make 2 distinct network calls.
+    #   Kodi's state.  Rather than make a "blind" call asking for
+    #   *every* InfoLabel and InfoBoolean of possible interest, the
+    #   batch below includes just those that were needed on the
+    #   previous update.  Kodi's state rarely changes from one update
+    #   to the next, so a single network call usually suffices.  If
+    #   the guess was wrong, the extra results are simply discarded and
+    #   request_info() makes a second call.
+    #
+    #   It might seem that a cheap Player.GetProperties poll could
+    #   detect an unchanged track and avoid re-fetching InfoLabels.
+    #   However, with the batch above there is no additional network
+    #   call to avoid, and any InfoLabel can be named in a layout's
+    #   dynamic fields.  Re-using an earlier response would risk
+    #   showing stale values.  Unchanged responses are instead caught
+    #   by same_frame(), skipping the render altogether.
     #
     #   Over wifi on an RPi3 on my home network, each call seems to
     #   take ~0.025 seconds.
     #
-    payload = {
-        "jsonrpc": "2.0",
-        "method": "Player.GetActivePlayers",
-        "id": 3,
-    }
-    response = requests.post(
-        rpc_url,
-        data=json.dumps(payload),
-        headers=headers).json()
+    results = batch_results(kodi_rpc(
+        encoded_payload(_prefetch_info, with_players=True)))
+    response = results.get(3, {})
 
-    if ('result' not in response.keys() or
+    if ('result' not in response or
         len(response['result']) == 0 or
         (response['result'][0]['type'] == 'picture' and not SLIDESHOW_ENABLED) or
         (response['result'][0]['type'] == 'video' and not VIDEO_ENABLED) or
@@ -2768,8 +3449,7 @@ def update_display():
         # for customized backgrounds, but this should do for the
         # moment.
         if (_static_image and IDLE_STATUS_ENABLED):
-            draw.rectangle(
-                [(0, 0), (_frame_size[0], _frame_size[1])], 'black', 'black')
+            image.paste(_blank_frame, (0, 0))
 
         # Check for screen press before proceeding.  A press when idle
         # generates the status screen.
@@ -2780,7 +3460,7 @@ def update_display():
         if _screen_press.is_set():
             _screen_press.clear()
             _screen_active = True
-            _screen_offtime = datetime.now() + timedelta(seconds=_screen_wake)
+            _screen_offtime = time.monotonic() + _screen_wake
 
         if ((_screen_active or IDLE_STATUS_ENABLED) and
             STATUS_ENABLED):
@@ -2795,36 +3475,31 @@ def update_display():
             elif response['result'][0]['type'] == 'audio':
                 summary = "Audio playing"
 
-            payload = [{ "jsonrpc": "2.0",
-                         "method": "XBMC.GetInfoLabels",
-                         "params": {"labels": STATUS_LABELS},
-                         "id": "4st" }]
-            if len(STATUS_BOOLEANS):
-                payload += [{ "jsonrpc": "2.0",
-                              "method": "XBMC.GetInfoBooleans",
-                              "params": {"booleans": STATUS_BOOLEANS},
-                              "id": "4sti" }]
-
-            status_resp = requests.post(
-                rpc_url,
-                data=json.dumps(payload),
-                headers=headers).json()
+            request_info('status', results)
+            _prefetch_info = 'status'
 
             # Add the summary string above to the response dictionary.
             # The try/except is in case Kodi communication gets
             # disrupted while showing the status screen!
             try:
-                status_dict = status_resp[0]['result']
-                if len(STATUS_BOOLEANS):
-                    status_dict.update(status_resp[1]['result'])
-
+                status_dict = merge_info('status', results)
                 status_dict['summary'] = summary
             except:
                 pass
 
-            status_screen(image, draw, status_dict)
+            frame_key = ('status', status_dict)
+            if not same_frame(frame_key):
+                status_screen(image, draw, status_dict)
             screen_on()
         else:
+            # Screen is blank (and dark), so there is no need to keep
+            # sending the same empty frame.  The image may still hold
+            # the last now-playing frame, so blank it before that
+            # frame first gets sent under this key.
+            frame_key = ('off',)
+            if not same_frame(frame_key):
+                image.paste(_blank_frame, (0, 0))
+            _prefetch_info = None
             screen_off()
 
     elif (response['result'][0]['type'] == 'video' and VIDEO_ENABLED):
@@ -2832,11 +3507,12 @@ def update_display():
         _kodi_playing = True
 
         # Should playing stop, do NOT go back to the status screen accidentally
-        _screen_offtime = datetime.now()
+        _screen_offtime = time.monotonic()
 
-        # Change display modes upon any screen press, forcing a
-        # re-fetch of any artwork.  Clear other state that may also be
-        # mode-specific.
+        # Change display modes upon any screen press, clearing state
+        # that may be mode-specific.  Artwork at the new layout's size
+        # comes from get_artwork()'s cache if it was used before, and
+        # the memoized text truncation results remain valid.
         if _screen_press.is_set():
             _screen_press.clear()
             if not VIDEO_LAYOUT_AUTOSELECT:
@@ -2845,29 +3521,13 @@ def update_display():
                 _last_image_time = None
                 _last_thumb = None
                 _static_image = None
-                truncate_line.cache_clear()
-                text_wrap.cache_clear()
-
-        # Retrieve InfoLabels and InfoBooleans in a single RPC call
-        payload = [{ "jsonrpc": "2.0",
-                     "method": "XBMC.GetInfoLabels",
-                     "params": {"labels": VIDEO_LABELS},
-                     "id": "4v" }]
-        if len(VIDEO_BOOLEANS):
-            payload += [{ "jsonrpc": "2.0",
-                          "method": "XBMC.GetInfoBooleans",
-                          "params": {"booleans": VIDEO_BOOLEANS},
-                          "id": "4vi" }]
-
-        response = requests.post(
-            rpc_url,
-            data=json.dumps(payload),
-            headers=headers).json()
-        # print("Response: ", json.dumps(response))
+
+        # Retrieve InfoLabels and InfoBooleans, if not already
+        # present in the batch response
+        request_info('video', results)
+        _prefetch_info = 'video'
         try:
-            video_info = response[0]['result']
-            if len(VIDEO_BOOLEANS):
-                video_info.update(response[1]['result'])
+            video_info = merge_info('video', results)
 
             # There seems to be a hiccup in DLNA/UPnP playback in which a
             # change (or stopping playback) causes a moment when
@@ -2878,7 +3538,9 @@ def update_display():
                 video_info["VideoPlayer.Cover"] == ""):
                 pass
             else:
-                video_screens(image, draw, video_info)
+                frame_key = ('video', video_dmode, video_info)
+                if not same_frame(frame_key):
+                    video_screens(image, draw, video_info)
                 screen_on()
         except BaseException:
             raise
@@ -2888,11 +3550,12 @@ def update_display():
         _kodi_playing = True
 
         # Should playing stop, do NOT go back to the status screen accidentally
-        _screen_offtime = datetime.now()
+        _screen_offtime = time.monotonic()
 
-        # Change display modes upon any screen press, forcing a
-        # re-fetch of any artwork.  Clear other state that may also be
-        # mode-specific.
+        # Change display modes upon any screen press, clearing state
+        # that may be mode-specific.  Artwork at the new layout's size
+        # comes from get_artwork()'s cache if it was used before, and
+        # the memoized text truncation results remain valid.
         if _screen_press.is_set():
             _screen_press.clear()
             if not AUDIO_LAYOUT_AUTOSELECT:
@@ -2901,29 +3564,13 @@ def update_display():
                 _last_image_time = None
                 _last_thumb = None
                 _static_image = None
-                truncate_line.cache_clear()
-                text_wrap.cache_clear()
-
-        # Retrieve InfoLabels and InfoBooleans in a single RPC call
-        payload = [{ "jsonrpc": "2.0",
-                     "method": "XBMC.GetInfoLabels",
-                     "params": {"labels": AUDIO_LABELS},
-                     "id": "4a" }]
-        if len(AUDIO_BOOLEANS):
-            payload += [{ "jsonrpc": "2.0",
-                          "method": "XBMC.GetInfoBooleans",
-                          "params": {"booleans": AUDIO_BOOLEANS},
-                          "id": "4ai" }]
-
-        response = requests.post(
-            rpc_url,
-            data=json.dumps(payload),
-            headers=headers).json()
-        # print("Response: ", json.dumps(response))
+
+        # Retrieve InfoLabels and InfoBooleans, if not already
+        # present in the batch response
+        request_info('audio', results)
+        _prefetch_info = 'audio'
         try:
-            track_info = response[0]['result']
-            if len(AUDIO_BOOLEANS):
-                track_info.update(response[1]['result'])
+            track_info = merge_info('audio', results)
 
             # JRiver uses semicolons to separate lists such as Artists.
             # Let's insert a trailing space such that word wrapping can
@@ -2946,7 +3593,9 @@ def update_display():
                  track_info["MusicPlayer.Title"] == ""))):
                 pass
             else:
-                audio_screens(image, draw, track_info)
+                frame_key = ('audio', audio_dmode, track_info)
+                if not same_frame(frame_key):
+                    audio_screens(image, draw, track_info)
                 screen_on()
         except BaseException:
             raise
@@ -2956,11 +3605,12 @@ def update_display():
         _kodi_playing = True
 
         # Should playing stop, do NOT go back to the status screen accidentally
-        _screen_offtime = datetime.now()
+        _screen_offtime = time.monotonic()
 
-        # Change display modes upon any screen press, forcing a
-        # re-fetch of any artwork.  Clear other state that may also be
-        # mode-specific.
+        # Change display modes upon any screen press, clearing state
+        # that may be mode-specific.  Artwork at the new layout's size
+        # comes from get_artwork()'s cache if it was used before, and
+        # the memoized text truncation results remain valid.
         if _screen_press.is_set():
             _screen_press.clear()
             if not SLIDESHOW_LAYOUT_AUTOSELECT:
@@ -2969,42 +3619,30 @@ def update_display():
                 _last_image_time = None
                 _last_thumb = None
                 _static_image = None
-                truncate_line.cache_clear()
-                text_wrap.cache_clear()
-
-        # Retrieve InfoLabels and InfoBooleans in a single RPC call
-        payload = [{ "jsonrpc": "2.0",
-                     "method": "XBMC.GetInfoLabels",
-                     "params": {"labels": SLIDESHOW_LABELS},
-                     "id": "4s" }]
-        if len(SLIDESHOW_BOOLEANS):
-            payload += [{ "jsonrpc": "2.0",
-                          "method": "XBMC.GetInfoBooleans",
-                          "params": {"booleans": SLIDESHOW_BOOLEANS},
-                          "id": "4si" }]
-
-        response = requests.post(
-            rpc_url,
-            data=json.dumps(payload),
-            headers=headers).json()
-        # print("Response: ", json.dumps(response))
+
+        # Retrieve InfoLabels and InfoBooleans, if not already
+        # present in the batch response
+        request_info('picture', results)
+        _prefetch_info = 'picture'
         try:
-            slide_info = response[0]['result']
-            if len(SLIDESHOW_BOOLEANS):
-                slide_info.update(response[1]['result'])
+            slide_info = merge_info('picture', results)
 
-            slideshow_screens(image, draw, slide_info)
+            frame_key = ('picture', slide_dmode, slide_info)
+            if not same_frame(frame_key):
+                slideshow_screens(image, draw, slide_info)
             screen_on()
 
         except BaseException:
             raise
 
     # Output to OLED/LCD display or framebuffer
-    device.display(image)
+    if not same_frame(frame_key):
+        display_image(image)
+    _last_frame_key = frame_key
     _lock.release()
 
 
-# Interrupt callback target from RPi.GPIO for T_IRQ
+# Interrupt callback target from RPi.GPIO (or gpiozero) for T_IRQ
 #
 #   Interesting threads on the RPi Forums:
 #
@@ -3014,14 +3652,23 @@ def update_display():
 #   GPIO callbacks occurring twice (Apr 2016)
 #   https://www.raspberrypi.org/forums/viewtopic.php?t=143478
 #
-def touch_callback(channel):
-    global _screen_press, _kodi_connected
+def touch_callback(channel=None):
+    global _kodi_connected
     print(datetime.now(), "Touchscreen pressed")
     if _kodi_connected:
-        _screen_press.set()
+        press_screen()
     return
 
 
+# Register a screen press and wake the main loop, so that the press
+# gets handled right away rather than at the next update.  Front ends
+# with their own touch handling (e.g., kodi_panel_fb_multitouch.py)
+# should call this rather than setting _screen_press directly.
+def press_screen():
+    _screen_press.set()
+    _kodi_wake.set()
+
+
 # Principle entry point for kodi_panel
 #
 # Set up touch interrupt, establish (and maintain) communication with
@@ -3030,7 +3677,8 @@ def touch_callback(channel):
 def main(device_handle):
     global device
     global _kodi_connected, _kodi_playing
-    global _screen_press
+    global _screen_press, _last_frame_key
+    global _display_thread, _touch_button, _notify_thread
     _kodi_connected = False
     _kodi_playing = False
 
@@ -3042,7 +3690,15 @@ def main(device_handle):
     logging.getLogger("urllib3").setLevel(logging.WARNING)
 
     # setup T_IRQ as a GPIO interrupt, if enabled, for resistive touchscreen
-    if (USE_TOUCH and not DEMO_MODE):
+    if (USE_TOUCH and not DEMO_MODE and TOUCH_GPIOZERO and Button is not None):
+        print(datetime.now(), "Setting up gpiozero Button for touchscreen interrupt")
+        # Without a pullup, gpiozero needs to be told the idle state
+        _touch_button = Button(TOUCH_INT,
+                               pull_up=True if TOUCH_PULLUP else None,
+                               active_state=None if TOUCH_PULLUP else False,
+                               bounce_time=TOUCH_DEBOUNCE / 1000.0)
+        _touch_button.when_pressed = touch_callback
+    elif (USE_TOUCH and not DEMO_MODE):
         print(datetime.now(), "Setting up GPIO pin for touchscreen interrupt")
         GPIO.setmode(GPIO.BCM)
         if (TOUCH_PULLUP):
@@ -3052,40 +3708,48 @@ def main(device_handle):
         GPIO.add_event_detect(TOUCH_INT, edge=GPIO.FALLING,
                               callback=touch_callback, bouncetime=TOUCH_DEBOUNCE)
 
+    # start display thread, if enabled
+    if (DISPLAY_THREAD and not DEMO_MODE and _display_thread is None):
+        print(datetime.now(), "Starting display thread")
+        _display_thread = threading.Thread(target=display_worker, daemon=True)
+        _display_thread.start()
+
+    # start listening for Kodi notifications, if enabled
+    if (KODI_NOTIFY and _notify_thread is None):
+        print(datetime.now(), "Starting Kodi notification thread")
+        _notify_thread = threading.Thread(target=notify_worker, daemon=True)
+        _notify_thread.start()
+
     # main communication loop
     while True:
         screen_on()
-        draw.rectangle(
-            [(0, 0), (_frame_size[0], _frame_size[1])], 'black', 'black')
-        draw.text((5, 5), "Waiting to connect with Kodi...",
-                  fill='white', font=_fonts["font_main"])
-        device.display(image)
-
+        if not same_frame(('waiting',)):
+            image.paste(_waiting_frame, (0, 0))
+            display_image(image)
+        _last_frame_key = ('waiting',)
+
+        # A refused connection is retried quickly at first, backing
+        # off to every 5 seconds should Kodi stay away.
+        backoff = 0.25
         while True:
             # ensure Kodi is up and accessible
-            payload = {
-                "jsonrpc": "2.0",
-                "method": "JSONRPC.Ping",
-                "id": 2,
-            }
-
             try:
                 print(datetime.now(), "Trying ping...")
-                response = requests.post(
-                    rpc_url, data=json.dumps(payload), headers=headers,
-                    timeout=5).json()
-                if response['result'] != 'pong':
+                response = kodi_rpc(_PING_PAYLOAD, timeout=5)
+                if response.get('result') != 'pong':
                     print(datetime.now(), "Kodi not available via HTTP-transported JSON-RPC.  Waiting...")
                     time.sleep(2)
                 else:
                     break
-            except (ConnectionRefusedError,
-                    requests.exceptions.ConnectionError):
+            except (ConnectionError, socket.timeout,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
                 if _lock.locked():
                     _lock.release()
-                time.sleep(5)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 5.0)
                 continue
-            except BaseException:
+            except Exception:
                 print(datetime.now(), "Unexpected error: ", sys.exc_info()[0])
                 track = traceback.format_exc()
                 print(track)
@@ -3098,12 +3762,12 @@ def main(device_handle):
         # Loop until Kodi goes away
         _kodi_connected = True
         _screen_press.clear()
+        next_update = time.monotonic()
         while True:
-            start_time = time.time()
             if DEMO_MODE:
                 keys = device._pygame.key.get_pressed()
                 if keys[device._pygame.K_SPACE]:
-                    _screen_press.set()
+                    press_screen()
                     print(datetime.now(), "Touchscreen pressed (emulated)")
 
             if _screen_press.is_set():
@@ -3111,8 +3775,9 @@ def main(device_handle):
 
             try:
                 update_display()
-            except (ConnectionRefusedError,
-                    requests.exceptions.ConnectionError):
+            except (ConnectionError, socket.timeout,
+                    requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout):
                 print(datetime.now(), "Communication disrupted!")
                 _kodi_connected = False
                 _kodi_playing = False
@@ -3134,23 +3799,32 @@ def main(device_handle):
 
             # If connecting to Kodi over an actual network connection,
             # update times can vary.  Rather than sleeping for a fixed
-            # duration, we might as well measure how long the update
-            # takes and then sleep whatever remains of that second.
-
-            elapsed = time.time() - start_time
-            if elapsed < 0.985:
-                _screen_press.wait(0.985 - elapsed)
-            else:
-                _screen_press.wait(1.0)
+            # duration, sleep until the next deadline so that updates
+            # keep a steady cadence.  Should an update overrun its
+            # slot, or a screen press or Kodi notification cut the
+            # wait short, the schedule restarts from the current time.
+            # The monotonic clock is used to stay immune to any system
+            # clock adjustment.
+
+            next_update += UPDATE_INTERVAL
+            delay = next_update - time.monotonic()
+            if delay > 0:
+                _kodi_wake.wait(delay)
+            if (delay <= 0 or _kodi_wake.is_set()):
+                next_update = time.monotonic()
+            _kodi_wake.clear()
 
 
 def shutdown():
-    if (USE_TOUCH and not DEMO_MODE):
+    if _touch_button is not None:
+        print(datetime.now(), "Removing touchscreen interrupt")
+        _touch_button.close()
+    elif (USE_TOUCH and not DEMO_MODE):
         print(datetime.now(), "Removing touchscreen interrupt")
         GPIO.remove_event_detect(TOUCH_INT)
         GPIO.cleanup()
-    # Clear screen
-    draw.rectangle(
-        [(0, 0), (_frame_size[0], _frame_size[1])], 'black', 'black')
-    device.display(image)
+    # Clear screen, waiting for the display thread (if any) to finish
+    image.paste(_blank_frame, (0, 0))
+    display_image(image)
+    _display_queue.join()
     print(datetime.now(), "Stopping kodi_panel")
@@ -85,8 +85,8 @@ def press_handler(event, touch):
     if event == TS_PRESS:
         print(datetime.now(), "Received TS_PRESS from touchscreen")
         # TODO: Capture coordinates of screen press
-        # Inform kodi_panel via a threading.Event it declares
-        kodi_panel_display._screen_press.set()
+        # Inform kodi_panel, which also wakes its update loop
+        kodi_panel_display.press_screen()
 
 # Install callback just for Slot 0, since current needs are simple        
 ts.touches[0].on_press = press_handler